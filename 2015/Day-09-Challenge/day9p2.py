@@ -1,7 +1,6 @@
 import os
 import re
-from itertools import permutations
-import math
+import operator
 
 def parse_distances(filepath):
     """
@@ -45,25 +44,45 @@ def parse_distances(filepath):
         
     return graph, sorted(list(locations))
 
-def calculate_route_distance(route, graph):
+def build_distance_matrix(graph, locations):
     """
-    Calculates the total distance for a given route (list of locations).
+    Flattens the graph into a list where distance_matrix[i * n + j] is the
+    distance between locations[i] and locations[j] (None if not connected).
     """
-    total_distance = 0
+    return [graph[loc_a].get(loc_b) for loc_a in locations for loc_b in locations]
+
+def held_karp(dist, n, longest=False):
+    """
+    Held-Karp DP over (visited mask, last node) for the best route through all n nodes,
+    starting at any node.
+
+    'dist' is a flat n*n list (dist[i * n + j], None = no edge).
+    dp[mask * n + last] holds the best cost of a route covering 'mask' that ends at
+    'last'; each entry is pulled from the smaller mask with one min()/max() over a
+    map() of the previous row, so the inner loop runs in C.
+
+    Returns:
+        int: the minimum (or maximum if longest) route cost, or +/-inf if no route exists.
+    """
+    pick = max if longest else min
+    bad = float('-inf') if longest else float('inf')
+    cost = [bad if d is None else d for d in dist]
+    into = [cost[j::n] for j in range(n)] # into[j][i] = cost of the edge i -> j
     
-    # Iterate over pairs of adjacent locations
-    for i in range(len(route) - 1):
-        loc_a = route[i]
-        loc_b = route[i+1]
-        
-        # Check if the path exists (it should, as the graph is complete)
-        if loc_b in graph[loc_a]:
-            total_distance += graph[loc_a][loc_b]
-        else:
-            # Should not happen with valid input, but acts as a safety measure
-            return float('inf') 
-            
-    return total_distance
+    dp = [bad] * (n << n)
+    for s in range(n):
+        dp[(1 << s) * n + s] = 0
+    
+    for mask in range(3, 1 << n):
+        for last in range(n):
+            bit = 1 << last
+            if not mask & bit or mask == bit:
+                continue
+            prev = (mask ^ bit) * n
+            dp[mask * n + last] = pick(map(operator.add, dp[prev:prev + n], into[last]))
+    
+    full = ((1 << n) - 1) * n
+    return pick(dp[full:full + n])
 
 def solve_shortest_longest_route(filepath):
     """
@@ -75,22 +94,14 @@ def solve_shortest_longest_route(filepath):
         print("Error: Could not parse graph or find locations.")
         return 0, 0
         
-    min_distance = float('inf')
-    max_distance = 0 # Initialize to 0 for maximization
-    
     print(f"Total locations to visit: {len(locations)} ({locations})")
-    print(f"Total routes to check: {math.factorial(len(locations))}")
     
-    # 1. Generate all possible routes (permutations)
-    all_routes = permutations(locations)
+    # 1. Build the distance matrix once
+    distance_matrix = build_distance_matrix(graph, locations)
     
-    # 2. Check the distance for each route
-    for route in all_routes:
-        distance = calculate_route_distance(route, graph)
-        
-        if distance != float('inf'):
-            min_distance = min(min_distance, distance)
-            max_distance = max(max_distance, distance)
+    # 2. Held-Karp for the shortest and (maximizing) the longest route, from any start
+    min_distance = held_karp(distance_matrix, len(locations))
+    max_distance = held_karp(distance_matrix, len(locations), longest=True)
             
     return min_distance, max_distance
 
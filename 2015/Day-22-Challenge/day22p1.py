@@ -41,176 +41,210 @@ def parse_boss_stats(filepath):
         
     return stats
 
-def apply_effects(state, mana_spent, is_player_turn=True):
+# --- Effect Constants ---
+POISON_DAMAGE = 3    # boss damage per Poison tick
+RECHARGE_MANA = 101  # mana per Recharge tick
+SHIELD_ARMOR = 7     # armor while Shield is active
+
+# --- Packed State Layout ---
+# A state (p_hp, p_mana, b_hp, s_timer, p_timer, r_timer) is interned as one int:
+# bits 0-2 Shield timer, 3-5 Poison timer, 6-8 Recharge timer, then boss HP,
+# player HP and player mana in fields sized for each fight by state_layout().
+# Effects and spells become plain integer arithmetic on it, and heap entries
+# are (estimate << state_bits) | state.
+TIMER_MASK = 0b111
+SHIELD_SHIFT = 0
+POISON_SHIFT = 3
+RECHARGE_SHIFT = 6
+BOSS_HP_SHIFT = 9
+
+TIMER_SHIFTS = {'Shield': SHIELD_SHIFT, 'Poison': POISON_SHIFT, 'Recharge': RECHARGE_SHIFT}
+
+# Cheapest mana per point of boss damage over all spells (Poison: 173 mana for 6 ticks of 3),
+# kept as a (mana, damage) ratio for the A* lower bound
+DAMAGE_RATE = min(((cost, dmg + (POISON_DAMAGE * duration if name == 'Poison' else 0))
+                   for name, (cost, dmg, heal, duration, mana_gain, armor) in SPELLS.items()
+                   if dmg or name == 'Poison'),
+                  key=lambda rate: rate[0] / rate[1])
+
+def state_layout(boss_hp):
     """
-    Applies effects and updates state at the start of the turn.
+    Sizes the boss HP, player HP and mana fields for a fight against 'boss_hp'.
+    
+    Every player turn casts a spell and at most one of any three in a row is Shield
+    (or Recharge), so the boss loses at least 2 HP every three turns and the fight
+    lasts under 3 * boss_hp player turns. Drain heals at most 2 HP a turn and
+    Recharge adds at most 2 * RECHARGE_MANA a turn, which bounds the other fields.
     
     Returns:
-        (new_state, new_mana_spent, current_armor, current_poison_dmg)
+        tuple: (boss_hp_mask, player_hp_shift, player_hp_mask, mana_shift, mana_mask, state_bits)
     """
-    
-    # Unpack current state
-    p_hp, p_mana, b_hp, s_timer, p_timer, r_timer = state
-    
-    current_armor = 0
-    current_poison_dmg = 0
-    
-    # 1. Apply Effects (Decay)
-    
-    # Recharge
-    if r_timer > 0:
-        p_mana += 101
-        r_timer -= 1
-        
-    # Poison
-    if p_timer > 0:
-        b_hp -= 3
-        p_timer -= 1
-        
-    # Shield
-    if s_timer > 0:
-        current_armor = 7
-        s_timer -= 1
-        
-    # 2. Check for Boss Death after effects (Poison can win the game)
-    if b_hp <= 0:
-        # Victory achieved. Update and return.
-        return (p_hp, p_mana, b_hp, s_timer, p_timer, r_timer), mana_spent, 0, 0, True
+    turns = 3 * max(boss_hp, 1)
+    boss_hp_bits = max(boss_hp, 1).bit_length()
+    player_hp_bits = (PLAYER_HP_START + 2 * turns).bit_length()
+    mana_bits = (PLAYER_MANA_START + 2 * RECHARGE_MANA * turns).bit_length()
+    player_hp_shift = BOSS_HP_SHIFT + boss_hp_bits
+    mana_shift = player_hp_shift + player_hp_bits
+    return ((1 << boss_hp_bits) - 1, player_hp_shift, (1 << player_hp_bits) - 1,
+            mana_shift, (1 << mana_bits) - 1, mana_shift + mana_bits)
 
-    # 3. Return updated values
-    new_state = (p_hp, p_mana, b_hp, s_timer, p_timer, r_timer)
-    return new_state, mana_spent, current_armor, 0, False # current_poison_dmg is always 0 for next step damage
+def pack_state(p_hp, p_mana, b_hp, s_timer, p_timer, r_timer, layout):
+    """
+    Interns a battle state into a single int (see the layout above).
+    Raises ValueError if a value does not fit its field.
+    """
+    boss_hp_mask, player_hp_shift, player_hp_mask, mana_shift, mana_mask, state_bits = layout
+    for field, value, mask in (('player HP', p_hp, player_hp_mask), ('player mana', p_mana, mana_mask),
+                               ('boss HP', b_hp, boss_hp_mask), ('Shield timer', s_timer, TIMER_MASK),
+                               ('Poison timer', p_timer, TIMER_MASK), ('Recharge timer', r_timer, TIMER_MASK)):
+        if not 0 <= value <= mask:
+            raise ValueError(f"{field} {value} does not fit the packed state (0..{mask})")
+    return (p_mana << mana_shift | p_hp << player_hp_shift | b_hp << BOSS_HP_SHIFT
+            | r_timer << RECHARGE_SHIFT | p_timer << POISON_SHIFT | s_timer << SHIELD_SHIFT)
 
+def unpack_state(state, layout):
+    """Inverse of pack_state: (p_hp, p_mana, b_hp, s_timer, p_timer, r_timer)."""
+    boss_hp_mask, player_hp_shift, player_hp_mask, mana_shift, mana_mask, state_bits = layout
+    return (state >> player_hp_shift & player_hp_mask, state >> mana_shift & mana_mask,
+            state >> BOSS_HP_SHIFT & boss_hp_mask, state >> SHIELD_SHIFT & TIMER_MASK,
+            state >> POISON_SHIFT & TIMER_MASK, state >> RECHARGE_SHIFT & TIMER_MASK)
 
-def solve_wizard_battle(filepath):
+def apply_effects(state, boss_hp_mask, recharge_step):
     """
-    Finds the least amount of mana required to win the fight using Dijkstra's/BFS.
+    Applies the start-of-turn effects directly to a packed state, where
+    'recharge_step' is RECHARGE_MANA shifted into the layout's mana field.
+    
+    Returns:
+        int: the new packed state, or None if Poison kills the boss
     """
-    boss_stats = parse_boss_stats(filepath)
-    BOSS_HP_START = boss_stats['HP']
-    BOSS_DAMAGE = boss_stats['Damage']
+    if state >> RECHARGE_SHIFT & TIMER_MASK:
+        state += recharge_step - (1 << RECHARGE_SHIFT)
+    if state >> POISON_SHIFT & TIMER_MASK:
+        # 2. Check for Boss Death after effects (Poison can win the game)
+        if state >> BOSS_HP_SHIFT & boss_hp_mask <= POISON_DAMAGE:
+            return None
+        state -= (POISON_DAMAGE << BOSS_HP_SHIFT) + (1 << POISON_SHIFT)
+    if state >> SHIELD_SHIFT & TIMER_MASK:
+        state -= 1 << SHIELD_SHIFT
+    return state
+
+def mana_lower_bound(state, boss_hp_mask):
+    """
+    Admissible A* estimate of the mana still needed: boss HP not covered by
+    the running Poison, paid for at the cheapest mana-per-damage rate.
+    """
+    remaining = (state >> BOSS_HP_SHIFT & boss_hp_mask) - POISON_DAMAGE * (state >> POISON_SHIFT & TIMER_MASK)
+    if remaining <= 0:
+        return 0
+    mana, damage = DAMAGE_RATE
+    return (remaining * mana + damage - 1) // damage
+
+def least_mana_to_win(boss_hp, boss_damage, penalty=0):
+    """
+    Finds the least amount of mana required to win the fight with A* over packed states,
+    where 'penalty' is the HP lost at the start of each player turn (1 in hard mode).
     
-    # The state is (p_hp, p_mana, b_hp, s_timer, p_timer, r_timer)
-    initial_state = (PLAYER_HP_START, PLAYER_MANA_START, BOSS_HP_START, 0, 0, 0)
+    Returns:
+        int: the least mana, or float('inf') if the player cannot win
+    """
+    # Spells as (cost, damage, heal, timer shift or None, duration) for packed arithmetic
+    casts = [(cost, dmg, heal, TIMER_SHIFTS.get(name), duration)
+             for name, (cost, dmg, heal, duration, mana_gain, armor) in SPELLS.items()]
+    
+    layout = state_layout(boss_hp)
+    boss_hp_mask, player_hp_shift, player_hp_mask, mana_shift, mana_mask, state_bits = layout
+    state_mask = (1 << state_bits) - 1
+    recharge_step = RECHARGE_MANA << mana_shift
+    initial_state = pack_state(PLAYER_HP_START, PLAYER_MANA_START, boss_hp, 0, 0, 0, layout)
     
-    # Priority Queue stores: (mana_spent, p_hp, p_mana, b_hp, s_timer, p_timer, r_timer)
-    pq = [(0, PLAYER_HP_START, PLAYER_MANA_START, BOSS_HP_START, 0, 0, 0)]
+    # Priority Queue stores: (mana_spent + lower bound) << state_bits | state
+    pq = [(mana_lower_bound(initial_state, boss_hp_mask) << state_bits) | initial_state]
     
-    # Dictionary to track minimum mana spent to reach a given game state
-    # Key: (p_hp, p_mana, b_hp, s_timer, p_timer, r_timer) -> Value: min_mana_spent
+    # Visited map: minimum mana spent to reach a given packed state
     min_mana_map = {initial_state: 0}
     
     min_winning_mana = float('inf')
 
     while pq:
-        mana_spent, p_hp, p_mana, b_hp, s_timer, p_timer, r_timer = heapq.heappop(pq)
-        current_state = (p_hp, p_mana, b_hp, s_timer, p_timer, r_timer)
-
-        # Optimization: If we found a cheaper way to reach this state, skip
-        if mana_spent > min_mana_map.get(current_state, float('inf')):
+        entry = heapq.heappop(pq)
+        estimate = entry >> state_bits
+        if estimate >= min_winning_mana:
+            break # every remaining path costs at least its estimate
+        state = entry & state_mask
+        mana_spent = estimate - mana_lower_bound(state, boss_hp_mask)
+        if mana_spent > min_mana_map[state]:
             continue
-
-        # Check for immediate win (should only happen if state was popped after a victory, 
-        # but we check for win only after the Boss turn)
-        # We ensure we don't proceed with paths already over the current minimum win cost
-        if mana_spent >= min_winning_mana:
-            continue
-
         
-        # ----------------------------------------------------
-        # --- 1. PLAYER TURN: Apply Effects & Cast Spell ---
-        # ----------------------------------------------------
+        # --- 1. PLAYER TURN: Apply Penalty, Effects, Spell ---
         
-        # Apply effects at the start of the Player's turn
-        (p_hp_eff, p_mana_eff, b_hp_eff, s_timer_eff, p_timer_eff, r_timer_eff), _, current_armor_eff, _, victory = \
-            apply_effects(current_state, mana_spent, is_player_turn=True)
-
-        if victory:
+        # 1a. Penalty (hard mode): Player loses HP before effects
+        if state >> player_hp_shift & player_hp_mask <= penalty:
+            continue # Player loses instantly
+        state -= penalty << player_hp_shift
+        
+        # 1b. Apply Effects at the start of the Player's turn
+        state = apply_effects(state, boss_hp_mask, recharge_step)
+        if state is None:
             min_winning_mana = min(min_winning_mana, mana_spent)
             continue
         
-        # Check if Player dies from Poison/etc. (Shouldn't happen on Player's turn start, but safe)
-        if p_hp_eff <= 0:
-            continue 
-
         # Try casting all 5 spells
-        for spell_name, (cost, dmg, heal, duration, mana_gain, armor) in SPELLS.items():
-            
-            # Check affordability
-            if p_mana_eff < cost:
-                continue
-
-            # Check if effect is already active
-            if spell_name == 'Shield' and s_timer_eff > 0:
-                continue
-            if spell_name == 'Poison' and p_timer_eff > 0:
+        for cost, dmg, heal, timer_shift, duration in casts:
+            # Check affordability and whether the effect is already active
+            if state >> mana_shift & mana_mask < cost:
                 continue
-            if spell_name == 'Recharge' and r_timer_eff > 0:
+            if timer_shift is not None and state >> timer_shift & TIMER_MASK:
                 continue
-                
-            # --- Cast Spell ---
             
+            # --- Cast Spell ---
             new_mana_spent = mana_spent + cost
-            p_mana_spell = p_mana_eff - cost
-            
-            p_hp_spell = p_hp_eff + heal
-            b_hp_spell = b_hp_eff - dmg
-            
-            s_timer_spell, p_timer_spell, r_timer_spell = s_timer_eff, p_timer_eff, r_timer_eff
-            
-            # Set new effect timer if applicable
-            if duration > 0:
-                if spell_name == 'Shield':
-                    s_timer_spell = duration
-                elif spell_name == 'Poison':
-                    p_timer_spell = duration
-                elif spell_name == 'Recharge':
-                    r_timer_spell = duration
             
             # Check for Boss Death after instant spell damage
-            if b_hp_spell <= 0:
+            if state >> BOSS_HP_SHIFT & boss_hp_mask <= dmg:
                 min_winning_mana = min(min_winning_mana, new_mana_spent)
                 continue
             
-            # ----------------------------------------------------
-            # --- 2. BOSS TURN: Apply Effects & Attack ---
-            # ----------------------------------------------------
+            new_state = state - (cost << mana_shift) + (heal << player_hp_shift) - (dmg << BOSS_HP_SHIFT)
+            if timer_shift is not None:
+                new_state |= duration << timer_shift
             
-            state_after_spell = (p_hp_spell, p_mana_spell, b_hp_spell, 
-                                 s_timer_spell, p_timer_spell, r_timer_spell)
-            
-            # 2a. Apply Effects at start of Boss's turn
-            (p_hp_boss_eff, p_mana_boss_eff, b_hp_boss_eff, s_timer_boss_eff, p_timer_boss_eff, r_timer_boss_eff), _, current_armor_boss_eff, _, victory = \
-                apply_effects(state_after_spell, new_mana_spent, is_player_turn=False)
-                
-            if victory:
+            # --- 2. BOSS TURN: Apply Effects & Attack ---
+            armor = SHIELD_ARMOR if new_state >> SHIELD_SHIFT & TIMER_MASK else 0
+            new_state = apply_effects(new_state, boss_hp_mask, recharge_step)
+            if new_state is None:
                 min_winning_mana = min(min_winning_mana, new_mana_spent)
                 continue
             
-            # 2b. Boss Attack
-            # The armor value comes from the effect applied at the START of the turn.
-            
-            # Boss damage is calculated using current_armor_boss_eff (which is 7 if shield is active, 0 otherwise)
-            boss_effective_damage = max(1, BOSS_DAMAGE - current_armor_boss_eff)
-            p_hp_final = p_hp_boss_eff - boss_effective_damage
-            
-            # 2c. Check for Player Death
-            if p_hp_final <= 0:
+            # 2b. Boss Attack, 2c. Check for Player Death
+            boss_effective_damage = max(1, boss_damage - armor)
+            if new_state >> player_hp_shift & player_hp_mask <= boss_effective_damage:
                 continue # Player loses, path discarded
-
-            # ----------------------------------------------------
-            # --- 3. Save New State ---
-            # ----------------------------------------------------
-            
-            final_state = (p_hp_final, p_mana_boss_eff, b_hp_boss_eff, 
-                           s_timer_boss_eff, p_timer_boss_eff, r_timer_boss_eff)
+            new_state -= boss_effective_damage << player_hp_shift
             
-            if new_mana_spent < min_mana_map.get(final_state, float('inf')):
-                min_mana_map[final_state] = new_mana_spent
-                heapq.heappush(pq, (new_mana_spent,) + final_state)
+            # --- 3. Save New State ---
+            if new_mana_spent < min_mana_map.get(new_state, float('inf')):
+                min_mana_map[new_state] = new_mana_spent
+                heapq.heappush(pq, ((new_mana_spent + mana_lower_bound(new_state, boss_hp_mask)) << state_bits) | new_state)
     
     return min_winning_mana
 
+def sweep_boss_stats(boss_hps, boss_damages, penalty=0):
+    """
+    Runs the duel for every (boss HP, boss damage) pair as one batch.
+    
+    Returns:
+        dict: least mana keyed by (boss_hp, boss_damage), float('inf') where the player cannot win
+    """
+    return {(hp, damage): least_mana_to_win(hp, damage, penalty)
+            for hp in boss_hps for damage in boss_damages}
+
+def solve_wizard_battle(filepath):
+    """
+    Finds the least amount of mana required to win the fight.
+    """
+    boss_stats = parse_boss_stats(filepath)
+    return least_mana_to_win(boss_stats['HP'], boss_stats['Damage'])
+
 # --- Main Execution Block ---
 if __name__ == "__main__":
     # Robust file path construction as requested:
@@ -1,4 +1,5 @@
 import os
+from typing import List, Tuple
 
 # --- Configuration: REPLACE THESE WITH YOUR TARGET COORDINATES ---
 # Target coordinates for the final code
@@ -27,20 +28,20 @@ def coordinate_to_index(R: int, C: int) -> int:
 
 def generate_code(index: int) -> int:
     """
-    Generates the code at the given sequence index k using the iterative formula.
+    Generates the code at the given sequence index k in closed form.
+    Applying the formula k - 1 times is the same as multiplying by
+    MULTIPLIER^(k-1), which pow() computes by modular exponentiation.
     """
-    current_code = START_CODE
-    
-    # We need to run the formula k - 1 times.
-    num_iterations = index - 1
-    
-    if num_iterations <= 0:
+    if index <= 1:
         return START_CODE
         
-    for _ in range(num_iterations):
-        current_code = (current_code * MULTIPLIER) % DIVISOR
-        
-    return current_code
+    return START_CODE * pow(MULTIPLIER, index - 1, DIVISOR) % DIVISOR
+
+def generate_codes(cells: List[Tuple[int, int]]) -> List[int]:
+    """
+    Batch lookup: the code at every 1-indexed (row, col) pair in 'cells', in order.
+    """
+    return [generate_code(coordinate_to_index(R, C)) for R, C in cells]
 
 def solve_weather_machine_puzzle():
     """
@@ -1,6 +1,5 @@
 import os
 import hashlib
-from collections import deque
 
 # --- Constants ---
 PASSCODE = "pgflpeqp" # Your puzzle input
@@ -17,61 +16,55 @@ MOVES = [
 # Doors are open if the hash char is one of these:
 OPEN_CHARS = {'b', 'c', 'd', 'e', 'f'}
 
-def get_hash_doors(passcode: str, path: str) -> str:
+def get_hash_doors(hasher) -> str:
     """
-    Generates the MD5 hash of (passcode + path) and returns the first four hex characters.
+    Returns the first four hex characters of an MD5 object already fed (passcode + path).
     """
-    s = (passcode + path).encode('utf-8')
-    return hashlib.md5(s).hexdigest()[:4]
+    return hasher.hexdigest()[:4]
 
-def is_valid_position(r, c):
-    """Checks if the position (r, c) is within the 4x4 grid bounds."""
-    return 0 <= r < GRID_SIZE and 0 <= c < GRID_SIZE
+def extend_hash(hasher, move_char: str):
+    """
+    Returns a copy of the MD5 state with one more move appended, so a child path
+    hashes a single byte instead of re-hashing (passcode + path) from scratch.
+    """
+    child = hasher.copy()
+    child.update(move_char.encode('utf-8'))
+    return child
+
+def is_valid_position(r, c, grid_size=GRID_SIZE):
+    """Checks if the position (r, c) is within the grid bounds."""
+    return 0 <= r < grid_size and 0 <= c < grid_size
 
-def solve_vault_puzzle(passcode: str):
+def solve_vault_puzzle(passcode: str, grid_size: int = GRID_SIZE):
     """
-    Performs BFS to find the shortest path string from (0, 0) to (3, 3).
+    Performs BFS to find the shortest path string from (0, 0) to the bottom-right room.
+    The frontier is expanded one whole level (path length) at a time, and every
+    node carries the MD5 state of (passcode + path) so expanding it hashes one byte.
     """
-    start_r, start_c = 0, 0
-    
-    # Queue stores: (r, c, path_string)
-    queue = deque([(start_r, start_c, "")])
-    
-    # Track visited (r, c) pairs to prevent obvious cycles (though not strictly necessary for BFS)
-    # Since the doors are dynamic, we only prune cycles that don't change the path length dramatically.
+    goal = (grid_size - 1, grid_size - 1)
     
-    # We remove the length-based pruning entirely to guarantee correctness.
+    # Frontier stores: (r, c, path_string, md5 state of passcode + path)
+    frontier = [(0, 0, "", hashlib.md5(passcode.encode('utf-8')))]
     
-    while queue:
-        r, c, path = queue.popleft()
-        
-        # Check for Goal
-        if (r, c) == GOAL_POS:
-            # BFS guarantees this is the shortest path length
-            return path
-            
-        # Optimization: Prune very long paths (safety net against runaway search)
-        if len(path) >= 5000:
-            continue
-            
-        # 1. Get open doors based on the current path
-        door_chars = get_hash_doors(passcode, path)
-        
-        # 2. Iterate through possible moves (U, D, L, R)
-        for i, (delta, move_char, hash_index) in enumerate(MOVES):
-            dr, dc = delta
+    while frontier:
+        next_frontier = []
+        for r, c, path, hasher in frontier:
+            # Check for Goal
+            if (r, c) == goal:
+                # BFS guarantees this is the shortest path length
+                return path
+                
+            # 1. Get open doors based on the current path
+            door_chars = get_hash_doors(hasher)
             
-            # Check door status
-            if door_chars[hash_index] in OPEN_CHARS:
-                # Door is open. Calculate next position.
+            # 2. Iterate through possible moves (U, D, L, R)
+            for (dr, dc), move_char, hash_index in MOVES:
+                # Check door status and the boundary condition
                 nr, nc = r + dr, c + dc
-                
-                # Check 3. Boundary Condition
-                if is_valid_position(nr, nc):
-                    next_path = path + move_char
+                if door_chars[hash_index] in OPEN_CHARS and is_valid_position(nr, nc, grid_size):
+                    next_frontier.append((nr, nc, path + move_char, extend_hash(hasher, move_char)))
                     
-                    # Since we removed path length pruning, every valid move is added to the queue
-                    queue.append((nr, nc, next_path))
+        frontier = next_frontier
                     
     return None
 
@@ -1,6 +1,5 @@
 import os
 import hashlib
-from collections import deque
 
 # --- Constants ---
 PASSCODE = "pgflpeqp" # Your puzzle input
@@ -17,59 +16,58 @@ MOVES = [
 # Doors are open if the hash char is one of these:
 OPEN_CHARS = {'b', 'c', 'd', 'e', 'f'}
 
-def get_hash_doors(passcode: str, path: str) -> str:
+def get_hash_doors(hasher) -> str:
     """
-    Generates the MD5 hash of (passcode + path) and returns the first four hex characters.
+    Returns the first four hex characters of an MD5 object already fed (passcode + path).
     """
-    s = (passcode + path).encode('utf-8')
-    return hashlib.md5(s).hexdigest()[:4]
+    return hasher.hexdigest()[:4]
 
-def is_valid_position(r, c):
-    """Checks if the position (r, c) is within the 4x4 grid bounds."""
-    return 0 <= r < GRID_SIZE and 0 <= c < GRID_SIZE
+def extend_hash(hasher, move_char: str):
+    """
+    Returns a copy of the MD5 state with one more move appended, so a child path
+    hashes a single byte instead of re-hashing (passcode + path) from scratch.
+    """
+    child = hasher.copy()
+    child.update(move_char.encode('utf-8'))
+    return child
+
+def is_valid_position(r, c, grid_size=GRID_SIZE):
+    """Checks if the position (r, c) is within the grid bounds."""
+    return 0 <= r < grid_size and 0 <= c < grid_size
 
-def solve_vault_puzzle_longest(passcode: str):
+def solve_vault_puzzle_longest(passcode: str, grid_size: int = GRID_SIZE):
     """
-    Performs DFS (using a stack) to find the longest path string from (0, 0) to (3, 3).
+    Explores every path level by level (one whole frontier per path length) to find
+    the length of the longest path from (0, 0) to the bottom-right room.
+    Paths end at the vault or when every door is shut, so the search terminates.
+    Each frontier node carries the MD5 state of (passcode + path), so expanding it
+    hashes one byte, and only the length is tracked instead of the path string.
     """
-    start_r, start_c = 0, 0
-    
-    # Stack stores: (r, c, path_string)
-    stack = [(start_r, start_c, "")]
+    goal = (grid_size - 1, grid_size - 1)
     
+    # Frontier stores: (r, c, md5 state of passcode + path)
+    frontier = [(0, 0, hashlib.md5(passcode.encode('utf-8')))]
+    path_length = 0
     max_path_length = 0
     
-    while stack:
-        r, c, path = stack.pop() # LIFO (DFS behavior)
-        
-        # Check for Goal
-        if (r, c) == GOAL_POS:
-            # Reached the vault. This path length is a candidate for the longest path.
-            max_path_length = max(max_path_length, len(path))
-            continue # CONTINUE SEARCHING to find longer paths
-            
-        # Optimization: Prune paths that are clearly too long (optional safety)
-        if len(path) >= 5000:
-            continue
-            
-        # 1. Get open doors based on the current path
-        door_chars = get_hash_doors(passcode, path)
-        
-        # 2. Iterate through possible moves (U, D, L, R)
-        for i, (delta, move_char, hash_index) in enumerate(MOVES):
-            dr, dc = delta
+    while frontier:
+        path_length += 1
+        next_frontier = []
+        for r, c, hasher in frontier:
+            # 1. Get open doors based on the current path
+            door_chars = get_hash_doors(hasher)
             
-            # Check door status
-            if door_chars[hash_index] in OPEN_CHARS:
-                # Door is open. Calculate next position.
+            # 2. Iterate through possible moves (U, D, L, R)
+            for (dr, dc), move_char, hash_index in MOVES:
                 nr, nc = r + dr, c + dc
-                
-                # Check 3. Boundary Condition
-                if is_valid_position(nr, nc):
-                    next_path = path + move_char
+                if door_chars[hash_index] in OPEN_CHARS and is_valid_position(nr, nc, grid_size):
+                    if (nr, nc) == goal:
+                        # Reached the vault. Levels only grow, so this is the longest so far.
+                        max_path_length = path_length
+                        continue # the path stops here; keep searching for longer ones
+                    next_frontier.append((nr, nc, extend_hash(hasher, move_char)))
                     
-                    # Push the new state onto the stack
-                    stack.append((nr, nc, next_path))
+        frontier = next_frontier
                     
     return max_path_length
 
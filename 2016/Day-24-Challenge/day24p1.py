@@ -1,34 +1,30 @@
 import os
 import re
-from collections import deque
-from itertools import permutations, combinations # FIXED: combinations added here
-
-# Directions: (dR, dC) for Up, Down, Left, Right
-DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+from array import array
+import operator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 def parse_map(filepath):
     """
-    Reads the map and finds the coordinates of all numbered points of interest (0, 1, 2, ...).
+    Reads the map once into a flat grid and finds all numbered points of interest (0, 1, 2, ...).
+    The map is padded with a ring of walls, so cell (r, c) lives at index
+    (r + 1) * COLS + (c + 1) and its neighbours are always index + offset.
     
     Returns:
-        tuple: (grid: list[str], pois: dict[int, tuple[int, int]], ROWS, COLS)
+        tuple: (open_cells: bytearray (1 = walkable), pois: dict[int, int] (flat index), ROWS, COLS)
+               where ROWS and COLS include the padding.
     """
     grid = []
-    pois = {}
     
     try:
         # Robust path reading
         input_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), filepath)
         with open(input_file, 'r') as f:
-            for r, line in enumerate(f):
+            for line in f:
                 clean_line = line.strip()
                 if not clean_line: continue
                 grid.append(clean_line)
-                
-                # Find Points of Interest (POIs)
-                for c, char in enumerate(clean_line):
-                    if char.isdigit():
-                        pois[int(char)] = (r, c)
 
     except FileNotFoundError:
         print(f"Error: Map file not found at '{filepath}'")
@@ -37,108 +33,126 @@ def parse_map(filepath):
     if not grid:
         return None, None, 0, 0
     
-    ROWS = len(grid)
-    COLS = len(grid[0])
+    ROWS = len(grid) + 2
+    COLS = len(grid[0]) + 2
+    open_cells = bytearray(ROWS * COLS)
+    pois = {}
     
-    return grid, pois, ROWS, COLS
+    for r, line in enumerate(grid, 1):
+        for c, char in enumerate(line, 1):
+            if char != '#':
+                open_cells[r * COLS + c] = 1
+            # Find Points of Interest (POIs)
+            if char.isdigit():
+                pois[int(char)] = r * COLS + c
+    
+    return open_cells, pois, ROWS, COLS
 
-def bfs_shortest_distance(grid, start_pos, end_pos, ROWS, COLS):
+def bfs_poi_distances(open_cells, ROWS, COLS, targets, start_pos):
     """
-    Performs BFS to find the shortest path length between two points.
+    Performs one BFS from a flat cell index, recording the steps to every
+    target cell and stopping as soon as all of them have been reached.
+    Distances live in a flat array instead of a dict of (r, c) tuples.
+    
+    Returns:
+        list: steps to each of 'targets', in order (None = unreachable)
     """
-    queue = deque([(start_pos, 0)]) # (r, c, distance)
-    visited = {start_pos}
+    offsets = (-COLS, COLS, -1, 1) # Up, Down, Left, Right
+    dist = array('i', [-1]) * (ROWS * COLS)
+    dist[start_pos] = 0
+    is_target = bytearray(ROWS * COLS)
+    for pos in targets:
+        is_target[pos] = 1
+    remaining = len(set(targets)) - is_target[start_pos]
+    frontier = [start_pos]
+    steps = 0
     
-    while queue:
-        (r, c), dist = queue.popleft()
-        
-        if (r, c) == end_pos:
-            return dist
-            
-        for dr, dc in DIRECTIONS:
-            nr, nc = r + dr, c + dc
-            next_pos = (nr, nc)
-            
-            # Check bounds and wall condition
-            if 0 <= nr < ROWS and 0 <= nc < COLS and \
-               grid[nr][nc] != '#' and next_pos not in visited:
-                
-                visited.add(next_pos)
-                queue.append((next_pos, dist + 1))
+    while frontier and remaining:
+        steps += 1
+        next_frontier = []
+        for pos in frontier:
+            for off in offsets:
+                nxt = pos + off
+                # The wall ring keeps every neighbour inside the grid
+                if open_cells[nxt] and dist[nxt] < 0:
+                    dist[nxt] = steps
+                    next_frontier.append(nxt)
+                    remaining -= is_target[nxt]
+        frontier = next_frontier
                 
-    return float('inf') # Path unreachable
+    return [dist[pos] if dist[pos] >= 0 else None for pos in targets]
 
-def build_distance_matrix(grid, pois, ROWS, COLS):
+def build_distance_matrix(open_cells, pois, ROWS, COLS, workers=None):
     """
-    Calculates the shortest path distance between all pairs of POIs.
+    Calculates the shortest path distance between all pairs of POIs,
+    with one early-terminating BFS per POI instead of one per pair.
+    With workers > 1 the BFS sweeps run in a process pool.
     
     Returns:
-        dict: distance_matrix[(id1, id2)] = distance
+        tuple: (poi_ids: sorted list, distance_matrix: flat list where
+               distance_matrix[i * n + j] is the distance from poi_ids[i]
+               to poi_ids[j], None if unreachable)
     """
     poi_ids = sorted(pois.keys())
-    distance_matrix = {}
+    targets = [pois[poi_id] for poi_id in poi_ids]
+    sweep = partial(bfs_poi_distances, open_cells, ROWS, COLS, targets)
     
-    # We use combinations to ensure we only calculate each pair once (A->B is B->A)
-    for id_a, id_b in combinations(poi_ids, 2):
-        pos_a = pois[id_a]
-        pos_b = pois[id_b]
-        
-        distance = bfs_shortest_distance(grid, pos_a, pos_b, ROWS, COLS)
-        
-        # Store bidirectional distance
-        distance_matrix[(id_a, id_b)] = distance
-        distance_matrix[(id_b, id_a)] = distance
+    if workers and workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            rows = list(pool.map(sweep, targets))
+    else:
+        rows = [sweep(pos) for pos in targets]
         
-    return distance_matrix
+    distance_matrix = [distance for row in rows for distance in row]
+    return poi_ids, distance_matrix
+
+def held_karp(dist, n, start):
+    """
+    Held-Karp DP over (visited mask, last node) for the shortest route through all n nodes.
+
+    'dist' is a flat n*n list (dist[i * n + j], None = no edge). The route starts at
+    'start'.
+    dp[mask * n + last] holds the shortest route from 'start' covering 'mask' that ends
+    at 'last'; each entry is pulled from the smaller mask with one min() over a map()
+    of the previous row, so the inner loop runs in C.
+
+    Returns:
+        int: the minimum route cost, or inf if no route exists.
+    """
+    cost = [float('inf') if d is None else d for d in dist]
+    into = [cost[j::n] for j in range(n)] # into[j][i] = cost of the edge i -> j
+    
+    dp = [float('inf')] * (n << n)
+    dp[(1 << start) * n + start] = 0
+    
+    for mask in range(3, 1 << n):
+        if not mask >> start & 1:
+            continue
+        for last in range(n):
+            if last == start or not mask >> last & 1:
+                continue
+            prev = (mask ^ 1 << last) * n
+            dp[mask * n + last] = min(map(operator.add, dp[prev:prev + n], into[last]))
+    
+    full = ((1 << n) - 1) * n
+    return min(dp[full:full + n])
 
 def solve_duct_puzzle(filepath):
     """
     Orchestrates the BFS and TSP solution to find the shortest route starting at 0 
     and visiting all others.
     """
-    grid, pois, ROWS, COLS = parse_map(filepath)
-    if grid is None or len(pois) < 2:
+    open_cells, pois, ROWS, COLS = parse_map(filepath)
+    if open_cells is None or len(pois) < 2:
         print("Error: Invalid map or insufficient points of interest.")
         return 0
 
     # 1. Calculate all pairwise shortest distances
-    distance_matrix = build_distance_matrix(grid, pois, ROWS, COLS)
-    
-    # 2. Setup for TSP
-    poi_ids = sorted(pois.keys())
-    start_node = 0
-    # Destinations are all nodes EXCEPT 0
-    destinations = [p for p in poi_ids if p != start_node]
-    
-    min_total_steps = float('inf')
+    poi_ids, distance_matrix = build_distance_matrix(open_cells, pois, ROWS, COLS)
     
-    # 3. Generate all permutations of the destinations
-    # We iterate over all paths that start at 0 and visit destinations 1..N
-    for path_order in permutations(destinations):
-        
-        current_route = [start_node] + list(path_order)
-        current_cost = 0
-        
-        # Calculate cost for the route
-        for i in range(len(current_route) - 1):
-            node_a = current_route[i]
-            node_b = current_route[i+1]
-            
-            # Look up distance (key is sorted for robustness, though either order works here)
-            # The matrix stores (small_id, large_id)
-            cost = distance_matrix.get((node_a, node_b))
-            
-            if cost is None:
-                # Fallback check (if matrix lookup failed)
-                cost = distance_matrix.get((node_b, node_a), float('inf'))
-                
-            if cost == float('inf'):
-                current_cost = float('inf') # Path invalid
-                break
-                
-            current_cost += cost
-        
-        min_total_steps = min(min_total_steps, current_cost)
+    # 2. Held-Karp over every path that starts at 0 and visits destinations 1..N
+    start_node = poi_ids.index(0)
+    min_total_steps = held_karp(distance_matrix, len(poi_ids), start=start_node)
 
     return min_total_steps
 
@@ -1,5 +1,7 @@
 import os
 import re
+import sys
+from array import array
 
 # --- Constants ---
 DIVISOR = 2147483647
@@ -8,6 +10,21 @@ FACTOR_B = 48271
 TOTAL_PAIRS = 40000000 # 40 million
 BIT_MASK = 65535      # 2^16 - 1 (for checking the lowest 16 bits)
 
+# --- Block Engine Layout ---
+# Values are produced BLOCK_LANES at a time, packed into one big integer with
+# one 64-bit lane per value (lane j occupies bits 64*j .. 64*j + 63).
+BLOCK_LANES = 1 << 14
+LANE_BITS = 64
+
+def lane_mask(pattern):
+    """Repeat a per-lane bit pattern across every lane of a block."""
+    return int.from_bytes(pattern.to_bytes(8, 'little') * BLOCK_LANES, 'little')
+
+LANES_DIVISOR = lane_mask(DIVISOR)   # 2^31 - 1 in every lane
+LANES_ONE = lane_mask(1)             # bit 0 of every lane
+LANES_LOW16 = lane_mask(BIT_MASK)    # lowest 16 bits of every lane
+LANES_BIT16 = lane_mask(1 << 16)     # bit 16 of every lane
+
 def parse_start_values(filepath):
     """
     Reads the starting values for Generator A and Generator B.
@@ -28,31 +45,68 @@ def parse_start_values(filepath):
         
     return start_a, start_b
 
+def generate_blocks(start, factor, total):
+    """
+    Yields (block, lanes) pairs covering the first 'total' generator values,
+    where 'block' packs consecutive values into 64-bit lanes and only the
+    first 'lanes' lanes are meaningful (the last block may be partial).
+
+    Jump-ahead: if the lanes hold x[i+1] .. x[i+B], multiplying the whole
+    block by factor^B mod (2^31 - 1) gives x[i+B+1] .. x[i+2B] at once.
+    Each lane product stays below 2^62, so lanes never carry into each other,
+    and the Mersenne modulus is reduced lane-wise with two shift-and-add folds.
+    """
+    # First block built one value at a time, then packed lane by lane
+    first = array('Q')
+    val = start
+    for _ in range(BLOCK_LANES):
+        val = (val * factor) % DIVISOR
+        first.append(val)
+    if sys.byteorder != 'little':
+        first.byteswap()
+    block = int.from_bytes(first.tobytes(), 'little')
+    jump = pow(factor, BLOCK_LANES, DIVISOR)
+
+    produced = 0
+    while produced < total:
+        lanes = min(BLOCK_LANES, total - produced)
+        yield block, lanes
+        produced += lanes
+        # x * jump mod (2^31 - 1): fold the high 31 bits onto the low 31 bits twice
+        block *= jump
+        block = (block & LANES_DIVISOR) + ((block >> 31) & LANES_DIVISOR)
+        block = (block & LANES_DIVISOR) + ((block >> 31) & LANES_ONE)
+
+def count_low16_matches(block_a, block_b, lanes):
+    """
+    Counts lanes (among the first 'lanes') whose lowest 16 bits agree.
+    Adding 0xFFFF to each lane's 16-bit XOR carries into bit 16 exactly
+    when the two values differ there; those carry bits are then the only
+    non-zero bytes of the block, so a byte count tallies them.
+    """
+    diff = (block_a ^ block_b) & LANES_LOW16
+    mismatches = (diff + LANES_LOW16) & LANES_BIT16
+    mismatch_bytes = mismatches.to_bytes(LANE_BITS // 8 * BLOCK_LANES, 'little')
+    return lanes - mismatch_bytes[:LANE_BITS // 8 * lanes].count(1)
+
 def solve_generator_puzzle(filepath):
     """
     Simulates the generator process for 40 million pairs and counts the matches.
     """
     start_a, start_b = parse_start_values(filepath)
     
-    current_a = start_a
-    current_b = start_b
     match_count = 0
     
     print(f"Starting A: {start_a}, Starting B: {start_b}")
     print(f"Simulating {TOTAL_PAIRS} pairs...")
 
-    for i in range(TOTAL_PAIRS):
-        
-        # 1. Generate next value for A
-        current_a = (current_a * FACTOR_A) % DIVISOR
-        
-        # 2. Generate next value for B
-        current_b = (current_b * FACTOR_B) % DIVISOR
-        
-        # 3. Check for match in the lowest 16 bits
-        # V % 2^16 is equivalent to V & 0xFFFF
-        if (current_a & BIT_MASK) == (current_b & BIT_MASK):
-            match_count += 1
+    # 1. Generate both sequences a block at a time, side by side
+    blocks_a = generate_blocks(start_a, FACTOR_A, TOTAL_PAIRS)
+    blocks_b = generate_blocks(start_b, FACTOR_B, TOTAL_PAIRS)
+
+    for (block_a, lanes), (block_b, _) in zip(blocks_a, blocks_b):
+        # 2. Check every pair in the block for a match in the lowest 16 bits
+        match_count += count_low16_matches(block_a, block_b, lanes)
             
     return match_count
 
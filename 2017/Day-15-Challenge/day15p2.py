@@ -1,5 +1,7 @@
 import os
 import re
+import sys
+from array import array
 
 # --- Constants ---
 DIVISOR = 2147483647
@@ -12,6 +14,24 @@ BIT_MASK = 65535      # 2^16 - 1 (for checking the lowest 16 bits)
 FILTER_A = 4
 FILTER_B = 8
 
+# --- Block Engine Layout ---
+# Values are produced BLOCK_LANES at a time, packed into one big integer with
+# one 64-bit lane per value (lane j occupies bits 64*j .. 64*j + 63).
+BLOCK_LANES = 1 << 14
+LANE_BITS = 64
+
+def lane_mask(pattern):
+    """Repeat a per-lane bit pattern across every lane of a block."""
+    return int.from_bytes(pattern.to_bytes(8, 'little') * BLOCK_LANES, 'little')
+
+LANES_DIVISOR = lane_mask(DIVISOR)   # 2^31 - 1 in every lane
+LANES_ONE = lane_mask(1)             # bit 0 of every lane
+LANES_CHUNK0 = lane_mask(0x3F)       # bits 0-5 of every lane
+LANES_CHUNK1 = lane_mask(0x3F << 8)  # bits 8-13 of every lane
+LANES_CHUNK2 = lane_mask(0x0F << 16) # bits 16-19 of every lane
+LANES_PAD = lane_mask(0xFFFFFFFFFF << 24) # bytes 3-7 of every lane
+DROP = b'\xff'                      # byte value deleted during compaction
+
 def parse_start_values(filepath):
     """
     Reads the starting values for Generator A and Generator B.
@@ -35,6 +55,72 @@ def parse_start_values(filepath):
         
     return start_a, start_b
 
+def generate_blocks(start, factor):
+    """
+    Yields the generator's values forever, BLOCK_LANES at a time, each block
+    packing consecutive values into 64-bit lanes.
+
+    Jump-ahead: if the lanes hold x[i+1] .. x[i+B], multiplying the whole
+    block by factor^B mod (2^31 - 1) gives x[i+B+1] .. x[i+2B] at once.
+    Each lane product stays below 2^62, so lanes never carry into each other,
+    and the Mersenne modulus is reduced lane-wise with two shift-and-add folds.
+    """
+    # First block built one value at a time, then packed lane by lane
+    first = array('Q')
+    val = start
+    for _ in range(BLOCK_LANES):
+        val = (val * factor) % DIVISOR
+        first.append(val)
+    if sys.byteorder != 'little':
+        first.byteswap()
+    block = int.from_bytes(first.tobytes(), 'little')
+    jump = pow(factor, BLOCK_LANES, DIVISOR)
+
+    while True:
+        yield block
+        # x * jump mod (2^31 - 1): fold the high 31 bits onto the low 31 bits twice
+        block *= jump
+        block = (block & LANES_DIVISOR) + ((block >> 31) & LANES_DIVISOR)
+        block = (block & LANES_DIVISOR) + ((block >> 31) & LANES_ONE)
+
+def collect_filtered(start, factor, multiple, count):
+    """
+    Returns the lowest 16 bits of the first 'count' generator values that are
+    divisible by 'multiple' (a power of two), as 3 bytes per value holding
+    bits 0-5, 6-11 and 12-15.
+
+    Each lane is rewritten in place to those 3 small bytes followed by DROP
+    padding, and lanes that fail the filter become DROP bytes entirely, so
+    bytes.translate(None, DROP) compacts a whole block in one C call.
+    """
+    shift = multiple.bit_length() - 1
+    lanes_low = lane_mask(multiple - 1)
+    lanes_flag = lane_mask(multiple)
+    found = bytearray()
+    for block in generate_blocks(start, factor):
+        # Bit 'shift' of a lane is set when its low bits are non-zero (not divisible)
+        rejected = (((block & lanes_low) + lanes_low) & lanes_flag) >> shift
+        packed = ((block & LANES_CHUNK0) | ((block << 2) & LANES_CHUNK1)
+                  | ((block << 4) & LANES_CHUNK2) | LANES_PAD
+                  | rejected * 0xFFFFFF)
+        found += packed.to_bytes(LANE_BITS // 8 * BLOCK_LANES, 'little').translate(None, DROP)
+        if len(found) >= 3 * count:
+            del found[3 * count:]
+            return found
+
+def count_matches(low_a, low_b):
+    """
+    Counts the positions where two collect_filtered() results agree: each of
+    the three chunk streams is XORed as one big integer, and a value matches
+    when all three of its chunk bytes XOR to zero.
+    """
+    count = len(low_a) // 3
+    diff = 0
+    for chunk in range(3):
+        diff |= (int.from_bytes(low_a[chunk::3], 'little')
+                 ^ int.from_bytes(low_b[chunk::3], 'little'))
+    return diff.to_bytes(count, 'little').count(0)
+
 def solve_generator_puzzle(filepath):
     """
     Simulates the generator process for 5 million pairs using the new 
@@ -42,43 +128,16 @@ def solve_generator_puzzle(filepath):
     """
     start_a, start_b = parse_start_values(filepath)
     
-    current_a = start_a
-    current_b = start_b
-    match_count = 0
-    
     print(f"Starting A: {start_a}, Starting B: {start_b}")
     print(f"Simulating up to {TOTAL_PAIRS} filtered pairs...")
 
-    # Generator A loop
-    def generate_filtered_a(initial_a):
-        val = initial_a
-        while True:
-            val = (val * FACTOR_A) % DIVISOR
-            if val % FILTER_A == 0:
-                yield val
-
-    # Generator B loop
-    def generate_filtered_b(initial_b):
-        val = initial_b
-        while True:
-            val = (val * FACTOR_B) % DIVISOR
-            if val % FILTER_B == 0:
-                yield val
-
-    # Initialize the generators
-    gen_a = generate_filtered_a(start_a)
-    gen_b = generate_filtered_b(start_b)
-
-    # 1. Compare 5 million pairs
-    for i in range(TOTAL_PAIRS):
-        
-        # 2. Get the next *filtered* value from each generator
-        current_a = next(gen_a)
-        current_b = next(gen_b)
-        
-        # 3. Check for match in the lowest 16 bits
-        if (current_a & BIT_MASK) == (current_b & BIT_MASK):
-            match_count += 1
+    # 1. Collect the lowest 16 bits of the first 5 million *filtered* values
+    # from each generator (each one runs independently of the other)
+    low_a = collect_filtered(start_a, FACTOR_A, FILTER_A, TOTAL_PAIRS)
+    low_b = collect_filtered(start_b, FACTOR_B, FILTER_B, TOTAL_PAIRS)
+
+    # 2. Compare the pairs in order and count the matches
+    match_count = count_matches(low_a, low_b)
             
     return match_count
 
@@ -1,6 +1,6 @@
 import os
 import re
-from typing import List, Dict
+from typing import List, Tuple
 
 # --- Constants ---
 # Initial sequence of programs (16 total: 0 to 15)
@@ -24,123 +24,82 @@ def parse_moves(filepath):
     
     return moves
 
-def perform_dance_move(programs: List[str], move: str) -> List[str]:
+def compile_dance(moves: List[str], programs: List[str]) -> Tuple[List[int], List[int]]:
     """
-    Applies a single dance move (sX, xA/B, or pA/B) to the list of programs.
+    Compiles one full dance into two permutations of 0..N-1:
+      - positions: spin/exchange moves, as "new slot i takes the program from slot positions[i]"
+      - labels:    partner moves, as "program label k ends up named labels[k]"
+    Partner moves only rename programs and spin/exchange only move slots, so the
+    two kinds commute and can be collected separately in a single pass.
     """
     N = len(programs)
-    move_type = move[0]
-    args = move[1:]
-    
-    if move_type == 's':
-        # Spin: sX (X programs move from end to front)
-        X = int(args)
-        shift = X % N
-        programs = programs[N - shift:] + programs[:N - shift]
-        
-    elif move_type == 'x':
-        # Exchange: xA/B (swap programs at positions A and B)
-        A_str, B_str = args.split('/')
-        A = int(A_str)
-        B = int(B_str)
-        programs[A], programs[B] = programs[B], programs[A]
-        
-    elif move_type == 'p':
-        # Partner: pA/B (swap programs named A and B)
-        A, B = args.split('/')
-        
-        try:
-            idx_A = programs.index(A)
-            idx_B = programs.index(B)
-            programs[idx_A], programs[idx_B] = programs[idx_B], programs[idx_A]
-        except ValueError:
-            pass 
+    index_of = {name: k for k, name in enumerate(programs)}
+
+    positions = list(range(N))
+    labels = list(range(N))
+    # where_label[k] = which original label currently carries name k
+    where_label = list(range(N))
+
+    for move in moves:
+        move_type = move[0]
+        args = move[1:]
+
+        if move_type == 's':
+            # Spin: sX (X programs move from end to front)
+            shift = int(args) % N
+            positions = positions[N - shift:] + positions[:N - shift]
 
-    return programs
+        elif move_type == 'x':
+            # Exchange: xA/B (swap programs at positions A and B)
+            A, B = (int(v) for v in args.split('/'))
+            positions[A], positions[B] = positions[B], positions[A]
 
-def solve_dance_cycle(filepath):
+        elif move_type == 'p':
+            # Partner: pA/B (swap programs named A and B)
+            A, B = (index_of[v] for v in args.split('/'))
+            ka, kb = where_label[A], where_label[B]
+            labels[ka], labels[kb] = B, A
+            where_label[A], where_label[B] = kb, ka
+
+    return positions, labels
+
+def permutation_power(perm: List[int], exponent: int) -> List[int]:
     """
-    Simulates the dance repeatedly to find the cycle length, then determines 
-    the final order after 1 billion dances.
+    Applies 'perm' to itself 'exponent' times (perm^e[i] = perm[perm[...[i]]])
+    by exponentiation by squaring: O(N log exponent).
+    """
+    result = list(range(len(perm)))
+    base = perm[:]
+    while exponent:
+        if exponent & 1:
+            result = [base[i] for i in result]
+        base = [base[i] for i in base]
+        exponent >>= 1
+    return result
+
+def solve_dance(filepath, programs: List[str] = INITIAL_PROGRAMS, total_dances: int = TOTAL_DANCES):
+    """
+    Compiles the dance into positional and label permutations once, raises
+    both to the number of dances, and applies them to the starting line-up.
+    No dance is replayed and no cycle search is needed.
     """
     dance_moves = parse_moves(filepath)
     if not dance_moves:
-        return "".join(INITIAL_PROGRAMS)
-        
-    # States map: {order_string: dance_number}
-    # This detects when the order repeats.
-    seen_states: Dict[str, int] = {} 
-    
-    # List to store the order at each step of the cycle for later lookup
-    cycle_orders: List[str] = []
-    
-    current_programs = INITIAL_PROGRAMS[:] # Start with a fresh copy
-    
-    print(f"Initial Order: {''.join(current_programs)}")
-    print(f"Total Dances to Simulate: {TOTAL_DANCES}")
-
-    dance_number = 0
-    
-    # 1. Simulate until a cycle is detected
-    while dance_number < TOTAL_DANCES:
-        
-        current_order = "".join(current_programs)
-        
-        if current_order in seen_states:
-            # Cycle Detected!
-            
-            # The cycle starts at the dance number stored in seen_states[current_order]
-            # but since we are interested in the cycle length back to the STARTING position,
-            # we check if the state is equal to the initial state ('abcdefghijklmnop').
-            
-            # The total cycle length is dance_number (total steps taken).
-            cycle_length = seen_states[current_order]
-            print(f"\nCycle Detected! Order '{current_order}' first appeared at dance {cycle_length}.")
-            print(f"Current dance number: {dance_number}")
-            
-            # 2. Calculate the remainder and final position
-            
-            # Effective dances needed after finding the cycle:
-            remaining_dances = (TOTAL_DANCES - dance_number) % (dance_number - cycle_length)
-            
-            # The required order is stored at cycle_orders[cycle_length + remaining_dances]
-            
-            # Calculate the required index within the cycle_orders list
-            # The order at dance_number is the first repetition. The order we want is 
-            # (TOTAL_DANCES % cycle_length).
-            
-            # Index into cycle_orders for the result (0-indexed list)
-            # cycle_orders[0] is the order AFTER dance 1.
-            
-            # Let's reset the cycle calculation for simplicity to the start:
-            final_index = TOTAL_DANCES % dance_number
-            
-            # The result is the state achieved after final_index dances.
-            return cycle_orders[final_index]
-
+        return "".join(programs)
 
-        # Record the state and the dance number *that achieved this state*
-        seen_states[current_order] = dance_number
-        cycle_orders.append(current_order)
-        
-        # Perform the dance
-        for move in dance_moves:
-            current_programs = perform_dance_move(current_programs, move)
-            
-        dance_number += 1
-        
-        if dance_number % 1000 == 0:
-            print(f"Simulated {dance_number} dances...")
+    positions, labels = compile_dance(dance_moves, programs)
+    positions = permutation_power(positions, total_dances)
+    labels = permutation_power(labels, total_dances)
 
-    # If TOTAL_DANCES was small enough (<= cycle_length), return the final order
-    return "".join(current_programs)
+    # Slot i holds the program that started in slot positions[i], renamed by labels
+    return "".join(programs[labels[positions[i]]] for i in range(len(programs)))
 
 # --- Main Execution Block ---
 if __name__ == "__main__":
     input_file = "input.txt"
     print(f"Starting dance simulation using data from: {os.path.abspath(input_file)}\n")
     
-    final_result = solve_dance_cycle(input_file)
+    final_result = solve_dance(input_file)
     
     print("\n" + "="*50)
     print("FINAL ORDER OF PROGRAMS AFTER ONE BILLION DANCES:")
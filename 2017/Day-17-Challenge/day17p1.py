@@ -1,52 +1,35 @@
 import os
-from typing import List
+from collections import deque
+from typing import Deque
 
 # --- Constants ---
 STEPS = 363
 TOTAL_INSERTIONS = 2017
 
-def solve_spinlock_puzzle(steps: int):
+def solve_spinlock_puzzle(steps: int, total_insertions: int = TOTAL_INSERTIONS):
     """
     Simulates the spinlock process for 2017 insertions to find the value 
     immediately following the last inserted value (2017).
+
+    The buffer is a deque kept rotated so the current position is always its
+    last element: stepping forward is a rotation and inserting is an append,
+    instead of a list.insert() that shifts the tail on every insertion.
     """
     
     # 1. Initialization
-    circular_buffer: List[int] = [0]
-    current_position: int = 0
+    circular_buffer: Deque[int] = deque([0])
     
     # 2. Simulation Loop: Insert values 1 up to 2017
-    for value_to_insert in range(1, TOTAL_INSERTIONS + 1):
-        buffer_length = len(circular_buffer)
-        
-        # 2a. Calculate the index of the position *AFTER* which the insertion should happen.
-        # Landed index (index of element before insertion)
-        landed_index = (current_position + steps) % buffer_length
-        
-        # Insertion index: inserts BEFORE this index. If landed on 0, inserts at 1.
-        # Since Python insert(i, x) inserts x AT index i, and we insert AFTER landed_index, 
-        # the insertion point is landed_index + 1.
-        insertion_index = landed_index + 1
-        
-        # 2b. Insert the new value
-        circular_buffer.insert(insertion_index, value_to_insert)
+    for value_to_insert in range(1, total_insertions + 1):
+        # 2a. Step forward: the element after the current one is at index 0,
+        # so rotating left by STEPS makes the landed element the last one.
+        circular_buffer.rotate(-(steps % len(circular_buffer)))
         
-        # 2c. Update the current position
-        # The new current position is the index of the inserted value.
-        current_position = insertion_index
-
-        # Optional: Print to check simulation against example
-        # if value_to_insert < 10:
-        #     print(f"Value {value_to_insert}: Current Pos {current_position}, Buffer: {circular_buffer}")
+        # 2b. Insert the new value right after it; it becomes the current position
+        circular_buffer.append(value_to_insert)
             
-    # 3. Final Result: Find the index of 2017 and return the value after it.
-    
-    # The current position is the index of the last inserted value (2017)
-    final_index = current_position
-    
-    # The value after 2017 is at index (final_index + 1) % final_length
-    final_length = len(circular_buffer)
-    value_after_2017 = circular_buffer[(final_index + 1) % final_length]
+    # 3. Final Result: the value after the current one (2017) is at index 0
+    value_after_2017 = circular_buffer[0]
     
     return value_after_2017
 
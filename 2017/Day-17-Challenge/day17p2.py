@@ -6,10 +6,13 @@ STEPS = 363
 TOTAL_VALUES = 50000000 # 50 million insertions + initial 0
 TOTAL_INSERTIONS = TOTAL_VALUES - 1
 
-def solve_spinlock_puzzle_p2(steps: int):
+def solve_spinlock_puzzle_p2(steps: int, total_values: int = TOTAL_VALUES):
     """
     Simulates the spinlock process for 50 million insertions without building 
     the list, tracking only the value at index 1.
+
+    Only an insertion that wraps around the buffer can land at index 1, so
+    every run of non-wrapping insertions is skipped in a single jump.
     """
     
     # 1. Initialization
@@ -17,29 +20,33 @@ def solve_spinlock_puzzle_p2(steps: int):
     # The value after 0 starts at 0 (meaning the buffer is [0])
     value_after_zero: int = 0 
     
-    # Simulation Loop: Insert values 1 up to 50,000,000
-    for value_to_insert in range(1, TOTAL_VALUES):
+    # Simulation Loop: Insert values 1 up to total_values - 1
+    value_to_insert = 1
+    while value_to_insert < total_values:
         buffer_length = value_to_insert # Length increases by 1 each step (starts at 1)
         
-        # 2a. Calculate insertion position (index where the value lands)
-        # Landed index (index of element before insertion) is (CP + STEPS) % L
-        landed_index = (current_position + steps) % buffer_length
+        # 2a. Skip ahead: insertion i (counting from 0) of a run stays inside
+        # the buffer while CP + (i + 1) * STEPS < L, each one moving CP by STEPS + 1
+        # and growing L by one.
+        skip = (buffer_length - current_position - 1) // steps
+        if skip > 0:
+            skip = min(skip, total_values - value_to_insert)
+            current_position += skip * (steps + 1)
+            value_to_insert += skip
+            continue
         
-        # Insertion index: inserts AT index (landed_index + 1)
-        insertion_index = landed_index + 1
+        # 2b. Wrapping insertion: inserts AT index ((CP + STEPS) % L) + 1
+        insertion_index = (current_position + steps) % buffer_length + 1
         
-        # 2b. Check if the insertion happens immediately after index 0
+        # 2c. Check if the insertion happens immediately after index 0
         if insertion_index == 1:
             # If the new value is inserted at index 1, it becomes the value after 0
             value_after_zero = value_to_insert
             
-        # 2c. Update the current position
+        # 2d. Update the current position
         # The new current position is the index of the inserted value.
         current_position = insertion_index
-
-        # Optional progress indicator
-        if value_to_insert % 1000000 == 0:
-            print(f"Processed {value_to_insert // 1000000}M insertions. Current value after 0: {value_after_zero}")
+        value_to_insert += 1
             
     return value_after_zero
 
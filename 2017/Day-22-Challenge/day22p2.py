@@ -1,6 +1,5 @@
 import os
-from collections import defaultdict
-from typing import Set, Tuple, Dict, List
+from typing import Tuple
 
 # --- Constants ---
 # CRITICAL CHANGE: Increased bursts for Part 2
@@ -11,6 +10,8 @@ STATE_CLEAN = 0
 STATE_WEAKENED = 1
 STATE_INFECTED = 2
 STATE_FLAGGED = 3
+# Sentinel stored in the ring around the grid: stepping on it means "grow"
+STATE_EDGE = 4
 
 # Direction Index Map (0=Up, 1=Right, 2=Down, 3=Left)
 DIRECTIONS = [
@@ -20,12 +21,61 @@ DIRECTIONS = [
     (-1, 0)  # 3: Left (West, -X)
 ]
 
-def parse_initial_grid(filepath) -> Dict[Tuple[int, int], int]:
+# New direction after reading a node, indexed by state * 4 + direction:
+# Clean turns LEFT, Weakened goes straight, Infected turns RIGHT, Flagged reverses
+TURN_TABLE = bytes(
+    (direction_index + turn) % 4
+    for turn in (3, 0, 1, 2)
+    for direction_index in range(4)
+)
+
+class CarrierGrid:
     """
-    Reads the initial map and extracts the coordinates of all infected nodes (#).
-    Stores them as { (x, y): STATE_INFECTED }. All others are STATE_CLEAN (0).
+    Square node grid stored as a flat bytearray (one byte per node state),
+    surrounded by a ring of STATE_EDGE sentinels.
+    When the carrier steps onto the ring the grid doubles in size and the
+    old contents are re-centred, so positions are plain integer offsets.
+    """
+
+    def __init__(self, size: int):
+        self._allocate(size)
+
+    def _allocate(self, size: int):
+        """Replace the cells with an empty size x size grid and its sentinel ring."""
+        self.size = size
+        # Full width including the sentinel ring
+        self.width = size + 2
+        self.cells = bytearray([STATE_EDGE]) * (self.width * self.width)
+        for row in range(1, size + 1):
+            start = row * self.width + 1
+            self.cells[start:start + size] = bytes(size)
+
+    def index(self, x: int, y: int) -> int:
+        """Flat index of node (x, y), where (0, 0) is the grid centre."""
+        half = self.size // 2
+        return (y + half + 1) * self.width + (x + half + 1)
+
+    def coordinates(self, pos: int) -> Tuple[int, int]:
+        """Inverse of index()."""
+        half = self.size // 2
+        row, col = divmod(pos, self.width)
+        return col - half - 1, row - half - 1
+
+    def grow(self):
+        """Double the grid, keeping (0, 0) at the centre."""
+        old_cells, old_width, old_size = self.cells, self.width, self.size
+        self._allocate(old_size * 2 + 1)
+        shift = (self.size - old_size) // 2
+        for row in range(1, old_size + 1):
+            src = row * old_width + 1
+            dst = (row + shift) * self.width + 1 + shift
+            self.cells[dst:dst + old_size] = old_cells[src:src + old_size]
+
+def parse_initial_grid(filepath) -> CarrierGrid:
+    """
+    Reads the initial map and marks all infected nodes (#) as STATE_INFECTED.
+    All others are STATE_CLEAN (0). The map centre becomes node (0, 0).
     """
-    grid_state = {}
     raw_grid = []
     
     try:
@@ -35,80 +85,66 @@ def parse_initial_grid(filepath) -> Dict[Tuple[int, int], int]:
             raw_grid = [line.strip() for line in f.readlines() if line.strip()]
     except FileNotFoundError:
         print(f"Error: Map file not found at '{filepath}'")
-        return grid_state
         
     if not raw_grid:
-        return grid_state
+        return CarrierGrid(1)
 
     ROWS = len(raw_grid)
     mid = ROWS // 2
+    grid = CarrierGrid(ROWS if ROWS % 2 else ROWS + 1)
     
     # Map array coordinates (r, c) to simulation coordinates (x, y)
     for r in range(ROWS):
         for c in range(ROWS):
             if raw_grid[r][c] == '#':
                 # Initial infected nodes start in the INFECTED state (2)
-                grid_state[(c - mid, r - mid)] = STATE_INFECTED
+                grid.cells[grid.index(c - mid, r - mid)] = STATE_INFECTED
                 
-    return grid_state
+    return grid
 
-def solve_sporifica_puzzle(filepath):
+def solve_sporifica_puzzle(filepath, num_bursts: int = NUM_BURSTS):
     """
     Simulates the Evolved Virus carrier's movement and counts bursts that cause infection.
     """
     # 1. Initialize the state
-    # grid_state: { (x, y): state_id } -> If key is missing, state is CLEAN (0).
-    grid_state = parse_initial_grid(filepath)
+    grid = parse_initial_grid(filepath)
+    cells = grid.cells
     
-    # Carrier starts at (0, 0) in the center of the grid
-    x, y = 0, 0
-    # Carrier starts facing Up (Index 0)
+    # Carrier starts at (0, 0) in the center of the grid, facing Up (Index 0)
+    pos = grid.index(0, 0)
     direction_index = 0
+    # Flat-index offsets for each direction (rebuilt whenever the grid grows)
+    steps = [dx + dy * grid.width for dx, dy in DIRECTIONS]
+    turn_table = TURN_TABLE
     
     infection_bursts_count = 0
     
     # 2. Simulation Loop
-    for burst in range(NUM_BURSTS):
+    for burst in range(num_bursts):
         
-        current_pos = (x, y)
-        # Current state: Get from dictionary, default to CLEAN (0)
-        current_state = grid_state.get(current_pos, STATE_CLEAN)
+        current_state = cells[pos]
+        if current_state == STATE_EDGE:
+            # Walked onto the sentinel ring: double the grid and re-locate
+            x, y = grid.coordinates(pos)
+            grid.grow()
+            cells = grid.cells
+            pos = grid.index(x, y)
+            steps = [dx + dy * grid.width for dx, dy in DIRECTIONS]
+            current_state = cells[pos]
         
         # --- Step 1: Turn based on Current State ---
-        if current_state == STATE_CLEAN:
-            # Clean (0): Turn LEFT (D - 1) % 4
-            direction_index = (direction_index + 3) % 4
-        elif current_state == STATE_WEAKENED:
-            # Weakened (1): NO turn (Straight)
-            pass
-        elif current_state == STATE_INFECTED:
-            # Infected (2): Turn RIGHT (D + 1) % 4
-            direction_index = (direction_index + 1) % 4
-        elif current_state == STATE_FLAGGED:
-            # Flagged (3): REVERSE (180 degrees) (D + 2) % 4
-            direction_index = (direction_index + 2) % 4
+        direction_index = turn_table[current_state * 4 + direction_index]
             
         # --- Step 2: Modify State ---
-        
-        next_state = (current_state + 1) % 4 # Cycle: 0->1->2->3->0
+        next_state = (current_state + 1) & 3 # Cycle: 0->1->2->3->0
+        cells[pos] = next_state
         
         if next_state == STATE_INFECTED:
             # Count this burst if the transition resulted in a new infection
             infection_bursts_count += 1 
-            
-        # Update the grid state dictionary
-        if next_state == STATE_CLEAN:
-            # Clean state is the default, so we remove the entry to save memory
-            if current_pos in grid_state:
-                del grid_state[current_pos]
-        else:
-            # Weakened, Infected, or Flagged states are stored
-            grid_state[current_pos] = next_state
 
         # --- Step 3: Move ---
-        dx, dy = DIRECTIONS[direction_index]
-        x += dx
-        y += dy
+        pos += steps[direction_index]
         
     return infection_bursts_count
 
@@ -1,6 +1,5 @@
 import os
 import re
-from collections import defaultdict
 
 def parse_blueprint(filepath):
     """
@@ -80,51 +79,76 @@ def parse_blueprint(filepath):
 
     return start_state, checksum_steps, rules
 
+# Tape cell value marking both ends of the allocated tape
+TAPE_EDGE = 2
+
+def compile_blueprint(start_state, rules):
+    """
+    Compiles the rules dict into a flat table with integer state ids.
+
+    Returns:
+        start_index (int): start_id * 2, the table index for (start state, value 0)
+        table (list): table[state_id * 2 + value] = (write_val, move_dir, next_state_id * 2)
+        state_names (list): state_names[state_id] is the state's name from the blueprint
+    Storing next_state_id * 2 lets the machine index the next rule by adding the
+    value it reads, with no string keys or nested dicts in the hot loop.
+    """
+    state_names = list(rules)
+    state_ids = {name: i for i, name in enumerate(state_names)}
+    table = [None] * (2 * len(state_ids))
+    for name, by_value in rules.items():
+        for value, (write_val, move_dir, next_state) in by_value.items():
+            if next_state not in state_ids:
+                raise ValueError(f"Rule for state {name} continues with unknown state {next_state}")
+            table[state_ids[name] * 2 + value] = (write_val, move_dir, state_ids[next_state] * 2)
+    return state_ids[start_state] * 2, table, state_names
+
+def grow_tape(tape, cursor):
+    """
+    Doubles the tape, re-centring the old cells, and returns (tape, cursor).
+    Both ends of the new tape hold the TAPE_EDGE sentinel again.
+    """
+    old_cells = tape[1:-1]
+    pad = len(old_cells) + 1
+    tape = bytearray([TAPE_EDGE]) + bytes(pad - 1) + old_cells + bytes(pad - 1) + bytearray([TAPE_EDGE])
+    return tape, cursor + pad - 1
+
 def run_turing_machine(start_state, steps, rules):
     """
     Simulates the Turing machine.
-    Using a set to store positions of '1's for efficiency (Tape is infinite 0s).
+    The rules are compiled to a flat table and the tape is a bytearray of 0/1
+    cells with a TAPE_EDGE sentinel at each end; stepping onto a sentinel
+    doubles the tape. The checksum is a byte count of the 1s at the end.
     """
-    # Tape stores indices where value is 1. All other indices are implicitly 0.
-    ones_on_tape = set()
-    
-    cursor = 0
-    state = start_state
-    
-    # Progress reporting interval
-    report_interval = steps // 10 if steps > 0 else 1
-    if report_interval == 0: report_interval = 1
+    if start_state not in rules:
+        print(f"Error: No rule defined for State {start_state}, Value 0")
+        return 0
+
+    state_index, table, state_names = compile_blueprint(start_state, rules)
+
+    tape = bytearray([TAPE_EDGE]) + bytes(1024) + bytearray([TAPE_EDGE])
+    cursor = len(tape) // 2
 
     print(f"Simulating {steps} steps...")
 
-    for step in range(1, steps + 1):
+    for step in range(steps):
         # 1. Read
-        current_val = 1 if cursor in ones_on_tape else 0
-        
+        current_val = tape[cursor]
+        if current_val == TAPE_EDGE:
+            tape, cursor = grow_tape(tape, cursor)
+            current_val = 0
+
         # 2. Lookup Rule
-        if state not in rules or current_val not in rules[state]:
-            print(f"Error: No rule defined for State {state}, Value {current_val}")
+        rule = table[state_index + current_val]
+        if rule is None:
+            print(f"Error: No rule defined for State {state_names[state_index // 2]}, Value {current_val}")
             break
-            
-        write_val, move_dir, next_state = rules[state][current_val]
-        
-        # 3. Write
-        if write_val == 1:
-            ones_on_tape.add(cursor)
-        else:
-            ones_on_tape.discard(cursor) # Set to 0
-            
-        # 4. Move
+
+        # 3. Write, 4. Move, 5. Transition
+        tape[cursor], move_dir, state_index = rule
         cursor += move_dir
-        
-        # 5. Transition
-        state = next_state
-        
-        if step % report_interval == 0:
-             # Optional progress bar
-             pass
 
-    return len(ones_on_tape)
+    return tape.count(1)
 
 def solve_turing_puzzle(filepath):
     start_state, steps, rules = parse_blueprint(filepath)
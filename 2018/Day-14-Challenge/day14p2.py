@@ -1,39 +1,76 @@
+def build_matcher(target):
+    # KMP automaton over decimal digits: step[state * 10 + digit] is the
+    # number of target digits matched after reading 'digit' in 'state'
+    m = len(target)
+    fail = [0] * (m + 1)
+    k = 0
+    for i in range(1, m):
+        while k and target[i] != target[k]:
+            k = fail[k]
+        if target[i] == target[k]:
+            k += 1
+        fail[i + 1] = k
+
+    step = [0] * ((m + 1) * 10)
+    for state in range(m + 1):
+        for digit in range(10):
+            if state < m and target[state] == digit:
+                step[state * 10 + digit] = state + 1
+            elif state:
+                step[state * 10 + digit] = step[fail[state] * 10 + digit]
+    return step
+
+
 def solve_sequence_search(target_str):
-    # Convert target string to list of integers for fast comparison
+    # Convert target string to digits and a matcher that reads one digit at a time
     target = [int(d) for d in target_str]
     target_len = len(target)
-    
-    scores = [3, 7]
+    step = build_matcher(target)
+    state = 0
+    for n, d in enumerate((3, 7), 1):
+        state = step[state * 10 + d]
+        if state == target_len:
+            return n - target_len
+
+    # Scoreboard: one byte per recipe in a preallocated buffer, doubled when full
+    scores = bytearray(1 << 20)
+    scores[0] = 3
+    scores[1] = 7
+    n = 2
     elf1 = 0
     elf2 = 1
-    
-    # We'll use a local reference to append for a tiny speed boost
-    append = scores.append
-    
+
     while True:
+        if n + 2 > len(scores):
+            scores.extend(bytes(len(scores)))
+
         s1 = scores[elf1]
         s2 = scores[elf2]
         recipe_sum = s1 + s2
-        
-        # Add recipes and check for match after each individual append
+
+        # Add recipes and check for match after each individual digit
         if recipe_sum >= 10:
             # First digit (1)
-            append(1)
-            if scores[-target_len:] == target:
-                return len(scores) - target_len
-            # Second digit
-            append(recipe_sum % 10)
-            if scores[-target_len:] == target:
-                return len(scores) - target_len
-        else:
-            # Single digit
-            append(recipe_sum)
-            if scores[-target_len:] == target:
-                return len(scores) - target_len
-            
+            scores[n] = 1
+            n += 1
+            state = step[state * 10 + 1]
+            if state == target_len:
+                return n - target_len
+            recipe_sum -= 10
+        # Single (or second) digit
+        scores[n] = recipe_sum
+        n += 1
+        state = step[state * 10 + recipe_sum]
+        if state == target_len:
+            return n - target_len
+
         # Move Elves
-        elf1 = (elf1 + 1 + s1) % len(scores)
-        elf2 = (elf2 + 1 + s2) % len(scores)
+        elf1 += 1 + s1
+        if elf1 >= n:
+            elf1 %= n
+        elf2 += 1 + s2
+        if elf2 >= n:
+            elf2 %= n
 
 if __name__ == "__main__":
     puzzle_input = "074501"
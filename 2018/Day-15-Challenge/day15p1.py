@@ -1,136 +1,159 @@
-import collections
+from array import array
+
+# Board cell codes: units stand on floor, so a cell is walkable only when FLOOR
+FLOOR, WALL, ELF, GOBLIN = 0, 1, 2, 3
 
 class Unit:
-    def __init__(self, x, y, u_type, attack_power=3):
-        self.x, self.y = x, y
-        self.type = u_type  # 'E' or 'G'
+    def __init__(self, p, u_type, attack_power=3):
+        self.p = p  # flat index y * w + x, so sorting by p is reading order
+        self.type = u_type  # ELF or GOBLIN
         self.hp = 200
         self.attack = attack_power
         self.alive = True
 
-    @property
-    def pos(self): return (self.y, self.x) # (row, col) for reading order
+class PathFinder:
+    """Reading-order BFS over the flat board with buffers reused across moves.
 
-def solve_combat(map_str, elf_attack=3):
+    Visited marks are generation stamps, so starting a new search is a
+    counter increment instead of clearing or reallocating a set.
+    """
+    def __init__(self, board, w):
+        self.board = board
+        self.offsets = (-w, -1, 1, w)  # neighbours in reading order
+        self.stamp = array('I', [0]) * len(board)
+        self.dist = array('i', [0]) * len(board)
+        self.gen = 0
+
+    def next_step(self, start, enemy):
+        board, offsets, stamp = self.board, self.offsets, self.stamp
+
+        # 1. Forward BFS level by level until a level holds cells next to an enemy
+        self.gen += 1
+        gen = self.gen
+        stamp[start] = gen
+        frontier = [start]
+        found_dist = 0
+        dest = None
+        while frontier:
+            found_dist += 1
+            nxt_frontier = []
+            for c in frontier:
+                for off in offsets:
+                    n = c + off
+                    if board[n] == FLOOR and stamp[n] != gen:
+                        stamp[n] = gen
+                        nxt_frontier.append(n)
+            frontier = nxt_frontier
+            in_range = [c for c in frontier
+                        if any(board[c + off] == enemy for off in offsets)]
+            if in_range:
+                dest = min(in_range)  # first in reading order
+                break
+        if dest is None: return None
+        if found_dist == 1: return dest
+
+        # 2. Reverse BFS from the destination, only as deep as the first step
+        self.gen += 1
+        gen = self.gen
+        dist = self.dist
+        stamp[dest] = gen
+        dist[dest] = 0
+        frontier = [dest]
+        for d in range(1, found_dist):
+            nxt_frontier = []
+            for c in frontier:
+                for off in offsets:
+                    n = c + off
+                    if board[n] == FLOOR and stamp[n] != gen:
+                        stamp[n] = gen
+                        dist[n] = d
+                        nxt_frontier.append(n)
+            frontier = nxt_frontier
+
+        for off in offsets:
+            step = start + off
+            if stamp[step] == gen and dist[step] == found_dist - 1:
+                return step
+        return None
+
+def simulate(map_str, elf_power=3, abort_on_elf_death=False):
+    """
+    Runs the battle on a flat board (walls and units in one bytearray).
+    Returns (rounds, total_hp), or (None, None) as soon as an elf dies
+    when abort_on_elf_death is set.
+    """
     lines = map_str.strip().split('\n')
-    walls = set()
+    w = max(len(line) for line in lines)
+    board = bytearray([WALL]) * (w * len(lines))
     units = []
     for y, line in enumerate(lines):
         for x, char in enumerate(line):
-            if char == '#': walls.add((y, x))
-            elif char == 'E': units.append(Unit(x, y, 'E', elf_attack))
-            elif char == 'G': units.append(Unit(x, y, 'G'))
+            p = y * w + x
+            if char == '#': continue
+            board[p] = FLOOR
+            if char == 'E': units.append(Unit(p, ELF, elf_power))
+            elif char == 'G': units.append(Unit(p, GOBLIN))
+    for u in units:
+        board[u.p] = u.type
+
+    occupant = {u.p: u for u in units}
+    alive = {ELF: 0, GOBLIN: 0}
+    for u in units:
+        alive[u.type] += 1
+    finder = PathFinder(board, w)
+    offsets = finder.offsets
 
     rounds = 0
     while True:
-        # 1. Sort units by reading order (y, x)
-        units.sort(key=lambda u: u.pos)
+        units.sort(key=lambda u: u.p)
+        full_round = True
         
-        full_round_complete = True
         for unit in units:
             if not unit.alive: continue
-            
-            # Identify current living enemies
-            enemies = [u for u in units if u.alive and u.type != unit.type]
-            if not enemies:
-                full_round_complete = False
+            enemy = GOBLIN if unit.type == ELF else ELF
+            if not alive[enemy]:
+                full_round = False
                 break
             
-            # 2. Movement Phase
-            if not is_adjacent_to_enemy(unit, enemies):
-                move_pos = find_move(unit, enemies, walls, units)
-                if move_pos:
-                    unit.y, unit.x = move_pos
+            # Move if not in range
+            if not any(board[unit.p + off] == enemy for off in offsets):
+                step = finder.next_step(unit.p, enemy)
+                if step is not None:
+                    board[unit.p] = FLOOR
+                    del occupant[unit.p]
+                    unit.p = step
+                    board[step] = unit.type
+                    occupant[step] = unit
 
-            # 3. Attack Phase
-            attack(unit, enemies)
+            # Attack the weakest adjacent enemy, ties in reading order
+            target = None
+            for off in offsets:
+                if board[unit.p + off] == enemy:
+                    e = occupant[unit.p + off]
+                    if target is None or e.hp < target.hp:
+                        target = e
+            if target is not None:
+                target.hp -= unit.attack
+                if target.hp <= 0:
+                    target.alive = False
+                    alive[target.type] -= 1
+                    board[target.p] = FLOOR
+                    del occupant[target.p]
+                    # IMMEDIATE FAILURE: If an Elf dies, this power level is invalid
+                    if target.type == ELF and abort_on_elf_death:
+                        return None, None
 
-        if not full_round_complete: break
-        
-        # Cleanup dead units and increment round
+        if not full_round: break
         units = [u for u in units if u.alive]
         rounds += 1
 
     total_hp = sum(u.hp for u in units if u.alive)
+    return rounds, total_hp
+
+def solve_combat(map_str, elf_attack=3):
+    rounds, total_hp = simulate(map_str, elf_attack)
     return rounds * total_hp
 
-def is_adjacent_to_enemy(unit, enemies):
-    for e in enemies:
-        if abs(unit.y - e.y) + abs(unit.x - e.x) == 1:
-            return True
-    return False
-
-def find_move(unit, enemies, walls, units):
-    occupied = {u.pos for u in units if u.alive and u != unit}
-    in_range = set()
-    for e in enemies:
-        for dy, dx in [(-1,0), (0,-1), (0,1), (1,0)]: # Reading order neighbors
-            p = (e.y + dy, e.x + dx)
-            if p not in walls and p not in occupied:
-                in_range.add(p)
-    
-    if not in_range: return None
-
-    # BFS to find nearest reachable square
-    queue = collections.deque([(unit.pos, 0)])
-    visited = {unit.pos}
-    dist_map = {}
-    found_dist = None
-    reachable_targets = []
-
-    while queue:
-        curr, d = queue.popleft()
-        if found_dist is not None and d > found_dist: break
-        if curr in in_range:
-            found_dist = d
-            reachable_targets.append(curr)
-        
-        for dy, dx in [(-1,0), (0,-1), (0,1), (1,0)]:
-            nxt = (curr[0] + dy, curr[1] + dx)
-            if nxt not in walls and nxt not in occupied and nxt not in visited:
-                visited.add(nxt)
-                queue.append((nxt, d + 1))
-    
-    if not reachable_targets: return None
-    
-    # Tie-break destination by reading order
-    chosen_dest = min(reachable_targets)
-
-    # BFS from destination back to current pos to find the step
-    # To respect reading order of STEP, we check the unit's neighbors
-    queue = collections.deque([(chosen_dest, 0)])
-    rev_visited = {chosen_dest}
-    rev_dist = {chosen_dest: 0}
-    while queue:
-        curr, d = queue.popleft()
-        for dy, dx in [(-1,0), (0,-1), (0,1), (1,0)]:
-            nxt = (curr[0] + dy, curr[1] + dx)
-            if nxt not in walls and nxt not in occupied and nxt not in rev_visited:
-                rev_visited.add(nxt)
-                rev_dist[nxt] = d + 1
-                queue.append((nxt, d + 1))
-    
-    # Choose neighbor of unit that is on shortest path and first in reading order
-    best_step = None
-    min_step_dist = float('inf')
-    for dy, dx in [(-1,0), (0,-1), (0,1), (1,0)]:
-        step_pos = (unit.y + dy, unit.x + dx)
-        if step_pos in rev_dist:
-            if rev_dist[step_pos] < min_step_dist:
-                min_step_dist = rev_dist[step_pos]
-                best_step = step_pos
-    return best_step
-
-def attack(unit, enemies):
-    adj_enemies = [e for e in enemies if abs(unit.y - e.y) + abs(unit.x - e.x) == 1]
-    if not adj_enemies: return
-    # Sort by HP (primary) and then Reading Order (secondary)
-    target = min(adj_enemies, key=lambda e: (e.hp, e.pos))
-    target.hp -= unit.attack
-    if target.hp <= 0:
-        target.alive = False
-
-# PASTE YOUR INPUT.TXT HERE
 raw_input = """################################
 ##########################.#####
 ##########################.#####
@@ -1,60 +1,148 @@
-import collections
+from array import array
+
+# Board cell codes: units stand on floor, so a cell is walkable only when FLOOR
+FLOOR, WALL, ELF, GOBLIN = 0, 1, 2, 3
+UNIT_HP = 200  # every unit starts with this many hit points
 
 class Unit:
-    def __init__(self, x, y, u_type, attack_power):
-        self.x, self.y = x, y
-        self.type = u_type
-        self.hp = 200
+    def __init__(self, p, u_type, attack_power=3):
+        self.p = p  # flat index y * w + x, so sorting by p is reading order
+        self.type = u_type  # ELF or GOBLIN
+        self.hp = UNIT_HP
         self.attack = attack_power
         self.alive = True
 
-    @property
-    def pos(self): return (self.y, self.x)
+class PathFinder:
+    """Reading-order BFS over the flat board with buffers reused across moves.
+
+    Visited marks are generation stamps, so starting a new search is a
+    counter increment instead of clearing or reallocating a set.
+    """
+    def __init__(self, board, w):
+        self.board = board
+        self.offsets = (-w, -1, 1, w)  # neighbours in reading order
+        self.stamp = array('I', [0]) * len(board)
+        self.dist = array('i', [0]) * len(board)
+        self.gen = 0
+
+    def next_step(self, start, enemy):
+        board, offsets, stamp = self.board, self.offsets, self.stamp
+
+        # 1. Forward BFS level by level until a level holds cells next to an enemy
+        self.gen += 1
+        gen = self.gen
+        stamp[start] = gen
+        frontier = [start]
+        found_dist = 0
+        dest = None
+        while frontier:
+            found_dist += 1
+            nxt_frontier = []
+            for c in frontier:
+                for off in offsets:
+                    n = c + off
+                    if board[n] == FLOOR and stamp[n] != gen:
+                        stamp[n] = gen
+                        nxt_frontier.append(n)
+            frontier = nxt_frontier
+            in_range = [c for c in frontier
+                        if any(board[c + off] == enemy for off in offsets)]
+            if in_range:
+                dest = min(in_range)  # first in reading order
+                break
+        if dest is None: return None
+        if found_dist == 1: return dest
+
+        # 2. Reverse BFS from the destination, only as deep as the first step
+        self.gen += 1
+        gen = self.gen
+        dist = self.dist
+        stamp[dest] = gen
+        dist[dest] = 0
+        frontier = [dest]
+        for d in range(1, found_dist):
+            nxt_frontier = []
+            for c in frontier:
+                for off in offsets:
+                    n = c + off
+                    if board[n] == FLOOR and stamp[n] != gen:
+                        stamp[n] = gen
+                        dist[n] = d
+                        nxt_frontier.append(n)
+            frontier = nxt_frontier
+
+        for off in offsets:
+            step = start + off
+            if stamp[step] == gen and dist[step] == found_dist - 1:
+                return step
+        return None
 
-def simulate(map_str, elf_power):
+def simulate(map_str, elf_power=3, abort_on_elf_death=False):
+    """
+    Runs the battle on a flat board (walls and units in one bytearray).
+    Returns (rounds, total_hp), or (None, None) as soon as an elf dies
+    when abort_on_elf_death is set.
+    """
     lines = map_str.strip().split('\n')
-    walls = set()
+    w = max(len(line) for line in lines)
+    board = bytearray([WALL]) * (w * len(lines))
     units = []
-    initial_elf_count = 0
-    
     for y, line in enumerate(lines):
         for x, char in enumerate(line):
-            if char == '#': walls.add((y, x))
-            elif char == 'E': 
-                units.append(Unit(x, y, 'E', elf_power))
-                initial_elf_count += 1
-            elif char == 'G': 
-                units.append(Unit(x, y, 'G', 3))
+            p = y * w + x
+            if char == '#': continue
+            board[p] = FLOOR
+            if char == 'E': units.append(Unit(p, ELF, elf_power))
+            elif char == 'G': units.append(Unit(p, GOBLIN))
+    for u in units:
+        board[u.p] = u.type
+
+    occupant = {u.p: u for u in units}
+    alive = {ELF: 0, GOBLIN: 0}
+    for u in units:
+        alive[u.type] += 1
+    finder = PathFinder(board, w)
+    offsets = finder.offsets
 
     rounds = 0
     while True:
-        units.sort(key=lambda u: u.pos)
+        units.sort(key=lambda u: u.p)
         full_round = True
         
         for unit in units:
             if not unit.alive: continue
-            
-            enemies = [u for u in units if u.alive and u.type != unit.type]
-            if not enemies:
+            enemy = GOBLIN if unit.type == ELF else ELF
+            if not alive[enemy]:
                 full_round = False
                 break
             
             # Move if not in range
-            if not any(abs(unit.y - e.y) + abs(unit.x - e.x) == 1 for e in enemies):
-                move_pos = find_move(unit, enemies, walls, units)
-                if move_pos:
-                    unit.y, unit.x = move_pos
-
-            # Attack
-            adj_enemies = [e for e in enemies if abs(unit.y - e.y) + abs(unit.x - e.x) == 1]
-            if adj_enemies:
-                target = min(adj_enemies, key=lambda e: (e.hp, e.pos))
+            if not any(board[unit.p + off] == enemy for off in offsets):
+                step = finder.next_step(unit.p, enemy)
+                if step is not None:
+                    board[unit.p] = FLOOR
+                    del occupant[unit.p]
+                    unit.p = step
+                    board[step] = unit.type
+                    occupant[step] = unit
+
+            # Attack the weakest adjacent enemy, ties in reading order
+            target = None
+            for off in offsets:
+                if board[unit.p + off] == enemy:
+                    e = occupant[unit.p + off]
+                    if target is None or e.hp < target.hp:
+                        target = e
+            if target is not None:
                 target.hp -= unit.attack
                 if target.hp <= 0:
                     target.alive = False
+                    alive[target.type] -= 1
+                    board[target.p] = FLOOR
+                    del occupant[target.p]
                     # IMMEDIATE FAILURE: If an Elf dies, this power level is invalid
-                    if target.type == 'E':
-                        return None, None 
+                    if target.type == ELF and abort_on_elf_death:
+                        return None, None
 
         if not full_round: break
         units = [u for u in units if u.alive]
@@ -63,51 +151,24 @@ def simulate(map_str, elf_power):
     total_hp = sum(u.hp for u in units if u.alive)
     return rounds, total_hp
 
-def find_move(unit, enemies, walls, units):
-    occupied = {u.pos for u in units if u.alive and u != unit}
-    in_range = set()
-    for e in enemies:
-        for dy, dx in [(-1,0), (0,-1), (0,1), (1,0)]:
-            p = (e.y + dy, e.x + dx)
-            if p not in walls and p not in occupied: in_range.add(p)
-    if not in_range: return None
-
-    queue = collections.deque([(unit.pos, 0)])
-    visited = {unit.pos}
-    reachable = []
-    found_dist = None
-
-    while queue:
-        curr, d = queue.popleft()
-        if found_dist is not None and d > found_dist: break
-        if curr in in_range:
-            found_dist = d
-            reachable.append(curr)
-        for dy, dx in [(-1,0), (0,-1), (0,1), (1,0)]:
-            nxt = (curr[0] + dy, curr[1] + dx)
-            if nxt not in walls and nxt not in occupied and nxt not in visited:
-                visited.add(nxt)
-                queue.append((nxt, d + 1))
-    
-    if not reachable: return None
-    chosen_dest = min(reachable)
-
-    # Find the best step via reverse BFS
-    queue = collections.deque([(chosen_dest, 0)])
-    rev_dist = {chosen_dest: 0}
-    while queue:
-        curr, d = queue.popleft()
-        for dy, dx in [(-1,0), (0,-1), (0,1), (1,0)]:
-            nxt = (curr[0] + dy, curr[1] + dx)
-            if nxt not in walls and nxt not in occupied and nxt not in rev_dist:
-                rev_dist[nxt] = d + 1
-                queue.append((nxt, d + 1))
-    
-    for dy, dx in [(-1,0), (0,-1), (0,1), (1,0)]:
-        step_pos = (unit.y + dy, unit.x + dx)
-        if step_pos in rev_dist and rev_dist[step_pos] == found_dist - 1:
-            return step_pos
-    return None
+def find_min_elf_power(map_str):
+    """
+    Smallest elf attack power with no elf deaths, with its (rounds, total_hp).
+    Elf power only changes the battle through the hits a goblin takes to die,
+    ceil(UNIT_HP / power), so only the smallest power for each hit count is
+    simulated, in increasing order. Winning is not monotone in power, so the
+    scan never skips a hit count.
+    Raises ValueError if even one-hit kills lose an elf.
+    """
+    power = 4
+    while power <= UNIT_HP:
+        rounds, hp_sum = simulate(map_str, power, abort_on_elf_death=True)
+        if rounds is not None:
+            return power, (rounds, hp_sum)
+        # Next power that kills a goblin in fewer hits
+        hits = -(-UNIT_HP // power)
+        power = -(-UNIT_HP // (hits - 1)) if hits > 1 else UNIT_HP + 1
+    raise ValueError(f"Elves lose an elf at every attack power up to {UNIT_HP}")
 
 # --- Main Search Loop ---
 raw_input = """################################
@@ -143,11 +204,6 @@ raw_input = """################################
 ######....G#......##############
 ################################"""
 
-power = 4
-while True:
-    rounds, hp_sum = simulate(raw_input, power)
-    if rounds is not None:
-        print(f"Elves win with {power} attack power.")
-        print(f"Outcome: {rounds} * {hp_sum} = {rounds * hp_sum}")
-        break
-    power += 1
\ No newline at end of file
+power, (rounds, hp_sum) = find_min_elf_power(raw_input)
+print(f"Elves win with {power} attack power.")
+print(f"Outcome: {rounds} * {hp_sum} = {rounds * hp_sum}")
\ No newline at end of file
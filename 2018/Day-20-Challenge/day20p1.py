@@ -1,52 +1,99 @@
 import os
+from array import array
 
-def solve():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(script_dir, 'input.txt')
+# Door bits for each direction, and the direction leading back through the same door
+DOOR_BITS = {'N': 1, 'S': 2, 'E': 4, 'W': 8}
+OPPOSITE = {'N': 'S', 'S': 'N', 'E': 'W', 'W': 'E'}
+MOVES = {'N': (0, 1), 'S': (0, -1), 'E': (1, 0), 'W': (-1, 0)}
 
-    with open(file_path, 'r') as f:
-        regex = f.read().strip()
+def map_doors(regex):
+    """
+    Walks the route regex carrying the whole set of current rooms, so every
+    option of a branch continues from every room it can end in.
+    Rooms are (x, y) packed as one int; returns {room: door bitmask}.
+    """
+    reach = len(regex) + 1  # no room is further than this from the origin
+    stride = 2 * reach + 1
+    step = {d: dx + dy * stride for d, (dx, dy) in MOVES.items()}
+    origin = reach * stride + reach
 
-    # Distances from (0,0) to each room (x, y)
-    distances = {(0, 0): 0}
-    # Stack to keep track of positions before branches '('
+    doors = {origin: 0}
+    current = {origin}
+    # Each open group keeps (rooms at its '(', rooms ending its finished options)
     stack = []
-    
-    curr_x, curr_y = 0, 0
-    
-    # Mapping directions to coordinate changes
-    moves = {
-        'N': (0, 1),
-        'S': (0, -1),
-        'E': (1, 0),
-        'W': (-1, 0)
-    }
 
     for char in regex:
         if char == '^' or char == '$':
             continue
         elif char == '(':
-            # Start of a branch: save current position
-            stack.append((curr_x, curr_y))
-        elif char == ')':
-            # End of a branch: go back to the start of the branch
-            curr_x, curr_y = stack.pop()
+            stack.append((current, set()))
         elif char == '|':
-            # Another option in the branch: reset to the saved position
-            curr_x, curr_y = stack[-1]
+            # Another option: it starts again from the rooms at the '('
+            starts, ends = stack[-1]
+            ends |= current
+            current = starts
+        elif char == ')':
+            # End of the group: carry on from every room any option ended in
+            starts, ends = stack.pop()
+            current = ends | current
         else:
-            # Moving to a new room
-            dx, dy = moves[char]
-            prev_dist = distances[(curr_x, curr_y)]
-            curr_x += dx
-            curr_y += dy
-            
-            # If the room is new or we found a shorter path, update it
-            if (curr_x, curr_y) not in distances or distances[(curr_x, curr_y)] > prev_dist + 1:
-                distances[(curr_x, curr_y)] = prev_dist + 1
+            bit, back, delta = DOOR_BITS[char], DOOR_BITS[OPPOSITE[char]], step[char]
+            moved = set()
+            for room in current:
+                doors[room] |= bit
+                nxt = room + delta
+                doors[nxt] = doors.get(nxt, 0) | back
+                moved.add(nxt)
+            current = moved
+
+    return doors, stride, origin
+
+def room_distances(doors, stride, origin):
+    """
+    BFS from the origin through the recorded doors on a flat grid cropped
+    to the mapped rooms. Returns the door count to every reachable room.
+    """
+    xs = [room % stride for room in doors]
+    ys = [room // stride for room in doors]
+    min_x, min_y = min(xs), min(ys)
+    width = max(xs) - min_x + 1
+    grid = bytearray(width * (max(ys) - min_y + 1))
+    for room, mask in doors.items():
+        grid[(room // stride - min_y) * width + room % stride - min_x] = mask
+
+    offsets = [(DOOR_BITS[d], dx + dy * width) for d, (dx, dy) in MOVES.items()]
+    start = (origin // stride - min_y) * width + origin % stride - min_x
+    dist = array('i', [-1]) * len(grid)
+    dist[start] = 0
+    frontier = [start]
+    found = [0]
+    steps = 0
+    while frontier:
+        steps += 1
+        next_frontier = []
+        for room in frontier:
+            mask = grid[room]
+            for bit, off in offsets:
+                if mask & bit and dist[room + off] < 0:
+                    dist[room + off] = steps
+                    next_frontier.append(room + off)
+        found.extend([steps] * len(next_frontier))
+        frontier = next_frontier
+    return found
+
+def solve():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    file_path = os.path.join(script_dir, 'input.txt')
+
+    with open(file_path, 'r') as f:
+        regex = f.read().strip()
+
+    # Record every door first, then measure exact shortest distances
+    doors, stride, origin = map_doors(regex)
+    distances = room_distances(doors, stride, origin)
 
     # The answer to Part 1 is the maximum distance found
-    return max(distances.values())
+    return max(distances)
 
 if __name__ == "__main__":
     result = solve()
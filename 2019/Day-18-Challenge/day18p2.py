@@ -1,83 +1,159 @@
 import os
 import sys
 import heapq
-from collections import deque
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 
-def solve_maze(grid, starts):
-    h = len(grid)
+def bfs_sweep(maze, w, node_at, src):
+    """One BFS from flat index 'src' over the maze string (y*w+x).
+
+    Records the steps to every point of interest (key, door or start)
+    reached without walking through another one, so the result is the
+    list of direct edges out of 'src' as (node, steps). node_at[pos] is
+    the node index at a cell (-1 for none). The maze is walled all
+    round, so neighbours are index + offset.
+    """
+    offsets = (1, -1, w, -w)
+    seen = bytearray(len(maze))
+    seen[src] = 1
+    edges = []
+    frontier = [src]
+    steps = 0
+    while frontier:
+        steps += 1
+        nxt_frontier = []
+        for pos in frontier:
+            for off in offsets:
+                nxt = pos + off
+                if seen[nxt] or maze[nxt] == '#':
+                    continue
+                seen[nxt] = 1
+                node = node_at[nxt]
+                if node >= 0:
+                    edges.append((node, steps))  # stop here, don't walk through
+                else:
+                    nxt_frontier.append(nxt)
+        frontier = nxt_frontier
+    return edges
+
+
+def build_poi_graph(maze, w, sources, workers=None):
+    """Direct edges between the points of interest at 'sources'.
+
+    Node i is the cell sources[i]. Returns one list of (node, steps)
+    per source, one BFS sweep each. With workers > 1 the sweeps run in
+    a process pool.
+    """
+    node_at = array('i', [-1]) * len(maze)
+    for i, pos in enumerate(sources):
+        node_at[pos] = i
+    sweep = partial(bfs_sweep, maze, w, node_at)
+    if workers and workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            return list(pool.map(sweep, sources))
+    return [sweep(src) for src in sources]
+
+
+def solve_maze(grid, starts, workers=None):
+    """Fewest steps for the robots at 'starts' to collect every key.
+
+    Keys are the lowercase letters in the maze and each uppercase letter
+    is the door for its lowercase key, so any number of keys works (a
+    door with no key in the maze is plain floor). The maze is reduced
+    to a graph of keys, doors and starts. Node ki < n_keys is key ki,
+    followed by one node per robot start and then the doors.
+
+    A search state is one int: the collected-key mask in the low n_keys
+    bits, then each robot's node in pos_bits bits. Heap entries are
+    (cost << state_bits) | state. The keys reachable from each
+    (node, mask) are found on demand with a Dijkstra over the graph
+    that treats locked doors as walls and stops at uncollected keys
+    (walking onto one collects it), and cached. Those distances are
+    exact, so a state is dropped when the same robot positions were
+    already settled holding a superset of its keys: that state can
+    replay any continuation of this one at no greater cost.
+    """
     w = len(grid[0])
-    keys = {}
-    for y in range(h):
-        for x in range(w):
-            c = grid[y][x]
-            if 'a' <= c <= 'z':
-                keys[c] = (x, y)
-
-    key_index = {k: i for i, k in enumerate(sorted(keys))}
+    maze = ''.join(''.join(row) for row in grid)
+
+    keys = sorted((c, i) for i, c in enumerate(maze) if c.islower())
+    key_index = {c: ki for ki, (c, _) in enumerate(keys)}
+    doors = [(key_index[c.lower()], i) for i, c in enumerate(maze)
+             if c.isupper() and c.lower() in key_index]
     total_keys = len(keys)
+    robots = len(starts)
+    sources = ([i for _, i in keys] + [y * w + x for x, y in starts]
+               + [i for _, i in doors])
+    graph = build_poi_graph(maze, w, sources, workers)
+    door_key = [-1] * (total_keys + robots) + [ki for ki, _ in doors]
     full_mask = (1 << total_keys) - 1
 
-    def bfs(src):
-        dist = {src: (0, 0)}
-        q = deque([src])
-        while q:
-            x, y = q.popleft()
-            d, dm = dist[(x, y)]
-            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-                nx, ny = x + dx, y + dy
-                c = grid[ny][nx]
-                if c == '#':
+    pos_bits = max(1, (total_keys + robots - 1).bit_length())
+    node_mask = (1 << pos_bits) - 1
+    state_bits = total_keys + pos_bits * robots
+    state_mask = (1 << state_bits) - 1
+
+    moves = {}
+
+    def reachable(node, mask):
+        # uncollected keys reachable from 'node' with 'mask' collected
+        cache_key = (node << total_keys) | mask
+        found = moves.get(cache_key)
+        if found is None:
+            found = []
+            dist = {node: 0}
+            heap = [(0, node)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if dist[u] != d:
                     continue
-                ndm = dm
-                if c.isupper():
-                    ndm |= 1 << key_index[c.lower()]
-                if (nx, ny) not in dist:
-                    dist[(nx, ny)] = (d + 1, ndm)
-                    q.append((nx, ny))
-        out = {}
-        for k, pos in keys.items():
-            if pos in dist:
-                out[k] = dist[pos]
-        return out
-
-    graph = {}
-    for s_i, s in enumerate(starts):
-        graph[('@' + str(s_i),)] = {}
-        for k, (d, dm) in bfs(s).items():
-            graph[('@' + str(s_i),)][k] = (d, dm)
-    for k, pos in keys.items():
-        graph[(k,)] = {}
-        for k2, (d, dm) in bfs(pos).items():
-            if k2 != k:
-                graph[(k,)][k2] = (d, dm)
-
-    start_pos = tuple('@' + str(i) for i in range(len(starts)))
-    heap = [(0, start_pos, 0)]
-    seen = {(start_pos, 0): 0}
+                if u < total_keys and not (mask >> u) & 1:
+                    found.append((u, d))
+                    continue
+                for v, steps in graph[u]:
+                    k = door_key[v]
+                    if k >= 0 and not (mask >> k) & 1:
+                        continue  # locked door
+                    nd = d + steps
+                    if nd < dist.get(v, 1 << 62):
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+            moves[cache_key] = found
+        return found
+
+    start_state = 0
+    for r in range(robots):
+        start_state |= (total_keys + r) << (total_keys + pos_bits * r)
+    best = {start_state: 0}
+    settled = {}
+    heap = [start_state]
 
     while heap:
-        cost, poss, mask = heapq.heappop(heap)
-        if seen.get((poss, mask), 10**18) != cost:
+        entry = heapq.heappop(heap)
+        cost = entry >> state_bits
+        state = entry & state_mask
+        if best[state] != cost:
             continue
+        mask = state & full_mask
         if mask == full_mask:
             return cost
-        for r in range(len(poss)):
-            pos = poss[r]
-            for k2, (d, dm) in graph[(pos,)].items():
-                ki = key_index[k2]
-                if mask & (1 << ki):
-                    continue
-                if dm & ~mask:
-                    continue
-                new_mask = mask | (1 << ki)
-                new_poss = list(poss)
-                new_poss[r] = k2
+        positions = state >> total_keys
+        masks = settled.setdefault(positions, [])
+        if any(m | mask == m for m in masks):
+            continue  # dominated by a cheaper state holding more keys
+        masks.append(mask)
+        for r in range(robots):
+            shift = total_keys + pos_bits * r
+            node = (positions >> (pos_bits * r)) & node_mask
+            base = state & ~(node_mask << shift)
+            for ki, d in reachable(node, mask):
+                new_state = base | (ki << shift) | (1 << ki)
                 nc = cost + d
-                key = (tuple(new_poss), new_mask)
-                if nc < seen.get(key, 10**18):
-                    seen[key] = nc
-                    heapq.heappush(heap, (nc, tuple(new_poss), new_mask))
+                if nc < best.get(new_state, 1 << 62):
+                    best[new_state] = nc
+                    heapq.heappush(heap, (nc << state_bits) | new_state)
     return None
 
 
@@ -85,7 +161,7 @@ def main():
     input_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
         os.path.dirname(os.path.abspath(__file__)), "input.txt")
 
-    with open(input_file, 'r') as f:
+    with open(input_file, 'r', encoding='utf-8') as f:
         grid = [list(line.rstrip('\n')) for line in f]
 
     # find the start and carve the four quadrants
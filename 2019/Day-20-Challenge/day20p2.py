@@ -1,19 +1,10 @@
 import os
 import sys
-from collections import deque
+import heapq
 
 
-def main():
-    input_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "input.txt")
-
-    with open(input_file, 'r') as f:
-        grid = [line.rstrip('\n') for line in f]
-
-    h = len(grid)
-    w = max(len(r) for r in grid)
-    grid = [r.ljust(w) for r in grid]
-
+def find_portals(grid, w, h):
+    """Map each portal label to its open cells as (x, y, is_outer)."""
     def is_letter(c):
         return 'A' <= c <= 'Z'
 
@@ -37,47 +28,105 @@ def main():
                     if 0 <= cx < w and 0 <= cy < h and grid[cy][cx] == '.':
                         portal_cells.setdefault(label, []).append(
                             (cx, cy, is_outer(cx, cy)))
+    return portal_cells
+
+
+def portal_graph(grid, w, cells):
+    """Walking distances between portal endpoints, one BFS per endpoint.
+
+    'cells' lists the endpoints as flat indices y*w+x; the result has
+    one list of (other endpoint, steps) per endpoint.
+    """
+    flat = ''.join(grid)
+    node_at = {pos: i for i, pos in enumerate(cells)}
+    offsets = (1, -1, w, -w)
+    graph = []
+    for src in cells:
+        edges = []
+        seen = {src}
+        frontier = [src]
+        steps = 0
+        while frontier:
+            steps += 1
+            next_frontier = []
+            for pos in frontier:
+                for off in offsets:
+                    nxt = pos + off
+                    if nxt in seen or flat[nxt] != '.':
+                        continue
+                    seen.add(nxt)
+                    if nxt in node_at:
+                        edges.append((node_at[nxt], steps))
+                    next_frontier.append(nxt)
+            frontier = next_frontier
+        graph.append(edges)
+    return graph
+
 
-    start = portal_cells['AA'][0][:2]
-    target = portal_cells['ZZ'][0][:2]
+def shortest_recursive_path(portal_cells, grid, w, max_level=None):
+    """Steps from AA to ZZ (both at level 0) through the recursive maze.
 
-    teleport = {}
+    The maze is compressed to its portal endpoints and searched with
+    Dijkstra over (endpoint, level) states, encoded as level * n + node.
+    Taking a portal costs one step: an inner one goes a level deeper, an
+    outer one a level up (never above 0). Levels are unbounded unless
+    max_level is given; if that cap cut off a portal and no path was
+    found within it, ValueError is raised instead of returning None.
+    """
+    nodes = []
     for label, cells in portal_cells.items():
-        if label in ('AA', 'ZZ') or len(cells) != 2:
+        for x, y, outer in cells:
+            nodes.append((label, y * w + x, outer))
+    n = len(nodes)
+    graph = portal_graph(grid, w, [pos for _, pos, _ in nodes])
+
+    partner = [-1] * n
+    for i, (label, _, _) in enumerate(nodes):
+        for j, (other, _, _) in enumerate(nodes):
+            if i != j and label == other:
+                partner[i] = j
+    start = next(i for i, node in enumerate(nodes) if node[0] == 'AA')
+    target = next(i for i, node in enumerate(nodes) if node[0] == 'ZZ')
+    dist = {start: 0}
+    heap = [(0, start)]
+    capped = False
+    while heap:
+        d, state = heapq.heappop(heap)
+        if dist[state] != d:
             continue
-        (x1, y1, o1), (x2, y2, o2) = cells
-        teleport[(x1, y1)] = (x2, y2, o1)  # leaving (x1,y1) -> (x2,y2), level change: outer->+1? 
-        teleport[(x2, y2)] = (x1, y1, o2)
-
-    # BFS over (pos, level); AA/ZZ only usable at level 0.
-    # Entering an inner portal goes to level+1; an outer portal to level-1.
-    dist = {(start[0], start[1], 0): 0}
-    q = deque([(start[0], start[1], 0)])
-    while q:
-        x, y, level = q.popleft()
-        if (x, y) == target and level == 0:
-            print(dist[(x, y, level)])
-            return
-        moves = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
-        if (x, y) in teleport:
-            nx, ny, outer = teleport[(x, y)]
-            if outer:
-                # leaving an outer portal: go to level - 1
-                nl = level - 1
-            else:
-                nl = level + 1
-            if nl >= 0 and (nx, ny) != start and (nx, ny) != target:
-                moves.append((nx, ny, nl))
-        for m in moves:
-            if len(m) == 3:
-                nx, ny, nl = m
-            else:
-                nx, ny = m
-                nl = level
-            if 0 <= nx < w and 0 <= ny < h and grid[ny][nx] == '.' \
-                    and (nx, ny, nl) not in dist:
-                dist[(nx, ny, nl)] = dist[(x, y, level)] + 1
-                q.append((nx, ny, nl))
+        if state == target:  # ZZ on level 0
+            return d
+        level, node = divmod(state, n)
+        moves = [(level * n + other, d + steps) for other, steps in graph[node]]
+        jump = partner[node]
+        if jump >= 0:
+            nl = level - 1 if nodes[node][2] else level + 1
+            if max_level is not None and nl > max_level:
+                capped = True
+            elif nl >= 0:
+                moves.append((nl * n + jump, d + 1))
+        for nstate, nd in moves:
+            if nd < dist.get(nstate, 1 << 62):
+                dist[nstate] = nd
+                heapq.heappush(heap, (nd, nstate))
+    if capped:
+        raise ValueError(f"No path from AA to ZZ within {max_level} levels")
+    return None
+
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "input.txt")
+
+    with open(input_file, 'r') as f:
+        grid = [line.rstrip('\n') for line in f]
+
+    h = len(grid)
+    w = max(len(r) for r in grid)
+    grid = [r.ljust(w) for r in grid]
+
+    portal_cells = find_portals(grid, w, h)
+    print(shortest_recursive_path(portal_cells, grid, w))
 
 
 if __name__ == "__main__":
@@ -1,37 +1,145 @@
 import os
 import sys
 
+# Each level is a 25-bit integer, bit y*5+x set when (x, y) holds a bug.
+FULL = (1 << 25) - 1
+CENTRE = 1 << 12
+VALID = FULL & ~CENTRE
 
-def neighbors(level, x, y):
-    """Yield (level, x, y) neighbours of cell (x, y) at 'level'."""
-    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-        nx, ny = x + dx, y + dy
-        if nx == 2 and ny == 2:
-            # the centre: goes to the next level's ring
-            if (x, y) == (1, 2):
-                for i in range(5):
-                    yield (level + 1, 0, i)
-            elif (x, y) == (3, 2):
-                for i in range(5):
-                    yield (level + 1, 4, i)
-            elif (x, y) == (2, 1):
-                for i in range(5):
-                    yield (level + 1, i, 0)
-            elif (x, y) == (2, 3):
-                for i in range(5):
-                    yield (level + 1, i, 4)
-        elif 0 <= nx < 5 and 0 <= ny < 5:
-            yield (level, nx, ny)
-        else:
-            # edge: goes to the parent level next to its centre
-            if nx < 0:
-                yield (level - 1, 1, 2)
-            elif nx >= 5:
-                yield (level - 1, 3, 2)
-            elif ny < 0:
-                yield (level - 1, 2, 1)
-            elif ny >= 5:
-                yield (level - 1, 2, 3)
+
+def bit(x, y):
+    return 1 << (y * 5 + x)
+
+
+def row_mask(y):
+    return sum(bit(x, y) for x in range(5))
+
+
+def col_mask(x):
+    return sum(bit(x, y) for y in range(5))
+
+
+TOP, BOTTOM = row_mask(0), row_mask(4)
+LEFT, RIGHT = col_mask(0), col_mask(4)
+
+# outer edges: every cell on the edge sees one cell of the parent level
+OUTER_EDGES = (
+    (TOP, bit(2, 1)),
+    (BOTTOM, bit(2, 3)),
+    (LEFT, bit(1, 2)),
+    (RIGHT, bit(3, 2)),
+)
+
+# inner edges: the cell next to the centre sees a whole edge of the child
+INNER_EDGES = (
+    (bit(2, 1), TOP),
+    (bit(2, 3), BOTTOM),
+    (bit(1, 2), LEFT),
+    (bit(3, 2), RIGHT),
+)
+
+
+def add_board(slices, board):
+    """Add one neighbour board to saturating (>=1, >=2, >=3) bit slices."""
+    one, two, three = slices
+    return (one | board, two | (one & board), three | (two & board))
+
+
+def add_slices(a, b):
+    """Sum two saturating bit-sliced counters."""
+    a1, a2, a3 = a
+    b1, b2, b3 = b
+    return (a1 | b1,
+            a2 | b2 | (a1 & b1),
+            a3 | b3 | (a2 & b1) | (a1 & b2))
+
+
+OUTER_KEY = sum(cell for _, cell in OUTER_EDGES)
+INNER_KEY = TOP | BOTTOM | LEFT | RIGHT
+
+# bit-sliced counts per masked edge pattern, filled on demand
+outer_cache = {}
+inner_cache = {}
+
+
+def outer_slices(outer):
+    """Counts contributed to the edge cells by the parent level."""
+    key = outer & OUTER_KEY
+    slices = outer_cache.get(key)
+    if slices is None:
+        slices = (0, 0, 0)
+        for edge, cell in OUTER_EDGES:
+            if key & cell:
+                slices = add_board(slices, edge)
+        outer_cache[key] = slices
+    return slices
+
+
+def inner_slices(inner):
+    """Counts contributed to the cells around the centre by the child level."""
+    key = inner & INNER_KEY
+    slices = inner_cache.get(key)
+    if slices is None:
+        slices = (0, 0, 0)
+        for cell, edge in INNER_EDGES:
+            # up to five bugs, but counts beyond three never matter
+            for _ in range(min(bin(key & edge).count('1'), 3)):
+                slices = add_board(slices, cell)
+        inner_cache[key] = slices
+    return slices
+
+
+def step(levels):
+    """Advance one minute; 'levels' is a list from outermost to innermost.
+
+    Neighbour counts are kept bit-sliced in three boards (at least one,
+    two and three bugs), which is all the rule needs to tell 1 and 2 apart.
+    """
+    # room for the recursion to spread one level outwards and inwards
+    padded = [0, 0] + levels + [0, 0]
+    new_levels = []
+    for i in range(1, len(padded) - 1):
+        cur = padded[i]
+        # the four neighbours on the same level
+        one = (cur << 1) & ~LEFT & FULL
+        board = (cur >> 1) & ~RIGHT
+        two = one & board
+        one |= board
+        board = (cur << 5) & FULL
+        three = two & board
+        two |= one & board
+        one |= board
+        board = cur >> 5
+        three |= two & board
+        two |= one & board
+        one |= board
+        # then the recursion edges, both looked up from small tables
+        b1, b2, b3 = add_slices(outer_slices(padded[i - 1]),
+                                inner_slices(padded[i + 1]))
+        three |= b3 | (two & b1) | (one & b2)
+        two |= b2 | (one & b1)
+        one |= b1
+        exactly_one = one & ~two
+        exactly_two = two & ~three
+        new_levels.append(
+            ((cur & exactly_one) | (~cur & (exactly_one | exactly_two)))
+            & VALID)
+
+    # drop empty levels at both ends so the list only grows when needed
+    lo, hi = 0, len(new_levels)
+    while lo < hi and not new_levels[lo]:
+        lo += 1
+    while hi > lo and not new_levels[hi - 1]:
+        hi -= 1
+    return new_levels[lo:hi]
+
+
+def simulate(start, minutes=200):
+    """Run 'minutes' of recursive bugs from a single level; return bug count."""
+    levels = [start & VALID]
+    for _ in range(minutes):
+        levels = step(levels)
+    return sum(bin(level).count('1') for level in levels)
 
 
 def main():
@@ -41,38 +149,13 @@ def main():
     with open(input_file, 'r') as f:
         lines = [line.strip() for line in f if line.strip()]
 
-    # levels: dict level -> set of bug cells
-    levels = {0: set()}
+    start = 0
     for y, line in enumerate(lines):
         for x, c in enumerate(line):
             if c == '#':
-                levels[0].add((x, y))
-
-    for _ in range(200):
-        # collect all cells that might change
-        cells = set()
-        for level, bugs in levels.items():
-            for (x, y) in bugs:
-                cells.add((level, x, y))
-                for n in neighbors(level, x, y):
-                    cells.add(n)
-        new_levels = {}
-        for (level, x, y) in cells:
-            if (x, y) == (2, 2):
-                continue
-            bug = (x, y) in levels.get(level, set())
-            cnt = sum(1 for n in neighbors(level, x, y)
-                      if n[1:] in levels.get(n[0], set()))
-            if bug:
-                alive = cnt == 1
-            else:
-                alive = 1 <= cnt <= 2
-            if alive:
-                new_levels.setdefault(level, set()).add((x, y))
-        levels = new_levels
-
-    total = sum(len(bugs) for bugs in levels.values())
-    print(total)
+                start |= bit(x, y)
+
+    print(simulate(start, 200))
 
 
 if __name__ == "__main__":
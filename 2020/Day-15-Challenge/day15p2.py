@@ -1,29 +1,57 @@
 import os
 import sys
+from array import array
 
 
-def main():
-    input_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "input.txt")
-
-    with open(input_file, 'r') as f:
-        nums = [int(x) for x in f.read().strip().split(',')]
+def new_last_seen(nums, turns):
+    """Preallocated last-seen table: turn index per number, -1 if unseen.
 
-    turns = 30000000
-    last = {}
+    Every spoken number after the starting ones is a gap between turns,
+    so it is below 'turns'; 4 bytes per slot and no dict rehashing.
+    """
+    last = array('i', [-1]) * max(turns, max(nums) + 1)
     for i, n in enumerate(nums[:-1]):
         last[n] = i
+    return last
 
+
+def play(nums, turns):
+    """Return the number spoken on turn 'turns'.
+
+    Same game as spoken(), but without a yield per turn, so the loop
+    is nothing but local array indexing.
+    """
+    if turns <= len(nums):
+        return nums[turns - 1]
+    last = new_last_seen(nums, turns)
     prev = nums[-1]
     for i in range(len(nums) - 1, turns - 1):
-        if prev in last:
-            nxt = i - last[prev]
-        else:
-            nxt = 0
+        seen = last[prev]
         last[prev] = i
-        prev = nxt
+        prev = i - seen if seen >= 0 else 0
+    return prev
+
+
+def spoken(nums, turns):
+    """Yield every number spoken, from turn 1 to turn 'turns'."""
+    yield from nums[:turns]
+    last = new_last_seen(nums, turns)
+    prev = nums[-1]
+    for i in range(len(nums) - 1, turns - 1):
+        seen = last[prev]
+        last[prev] = i
+        prev = i - seen if seen >= 0 else 0
+        yield prev
+
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "input.txt")
+
+    with open(input_file, 'r') as f:
+        nums = [int(x) for x in f.read().strip().split(',')]
 
-    print(prev)
+    print(play(nums, 30000000))
 
 
 if __name__ == "__main__":
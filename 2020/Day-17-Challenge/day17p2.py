@@ -1,5 +1,56 @@
 import os
 import sys
+from collections import Counter
+from itertools import product
+
+
+def axis_targets(v, mirrored):
+    """(target, multiplicity) pairs that coordinate v reaches along one axis.
+
+    On a mirrored axis only the non-negative half is stored: a cell at v
+    also stands for its image at -v, so the image's hits on the half-space
+    are folded back in (only v == 1 reaches 0 from the other side).
+    """
+    if not mirrored:
+        return ((v - 1, 1), (v, 1), (v + 1, 1))
+    if v == 0:
+        return ((0, 1), (1, 1))
+    if v == 1:
+        return ((0, 2), (1, 1), (2, 1))
+    return ((v - 1, 1), (v, 1), (v + 1, 1))
+
+
+def simulate(plane, dims=4, cycles=6):
+    """Run Conway cubes for 'cycles' steps in 'dims' dimensions.
+
+    'plane' is the set of active (x, y) cells of the starting slice; every
+    axis beyond x and y starts at 0, so the state stays mirror-symmetric on
+    those axes and only their non-negative half-space is simulated.
+    Returns the number of active cubes in the full space.
+    """
+    extra = dims - 2
+    mirrored = (False, False) + (True,) * extra
+    active = {(x, y) + (0,) * extra for (x, y) in plane}
+
+    for _ in range(cycles):
+        counts = Counter()
+        for cell in active:
+            for combo in product(*(axis_targets(v, m)
+                                   for v, m in zip(cell, mirrored))):
+                weight = 1
+                target = []
+                for t, mult in combo:
+                    target.append(t)
+                    weight *= mult
+                counts[tuple(target)] += weight
+            # the cell itself was counted once as its own neighbour
+            counts[cell] -= 1
+
+        active = {cell for cell, n in counts.items()
+                  if n == 3 or (n == 2 and cell in active)}
+
+    # each stored cell stands for 2 ** (non-zero mirrored coords) cubes
+    return sum(1 << sum(1 for v in cell[2:] if v) for cell in active)
 
 
 def main():
@@ -9,45 +60,14 @@ def main():
     with open(input_file, 'r') as f:
         grid = [list(line.strip()) for line in f if line.strip()]
 
-    # active cells as a set of (x, y, z, w)
-    active = set()
+    # active cells of the starting (x, y) slice
+    plane = set()
     for y, row in enumerate(grid):
         for x, c in enumerate(row):
             if c == '#':
-                active.add((x, y, 0, 0))
-
-    for _ in range(6):
-        cells = set()
-        for (x, y, z, w) in active:
-            for dx in (-1, 0, 1):
-                for dy in (-1, 0, 1):
-                    for dz in (-1, 0, 1):
-                        for dw in (-1, 0, 1):
-                            if dx == 0 and dy == 0 and dz == 0 and dw == 0:
-                                continue
-                            cells.add((x + dx, y + dy, z + dz, w + dw))
-            cells.add((x, y, z, w))
-
-        new_active = set()
-        for (x, y, z, w) in cells:
-            n = 0
-            for dx in (-1, 0, 1):
-                for dy in (-1, 0, 1):
-                    for dz in (-1, 0, 1):
-                        for dw in (-1, 0, 1):
-                            if dx == 0 and dy == 0 and dz == 0 and dw == 0:
-                                continue
-                            if (x + dx, y + dy, z + dz, w + dw) in active:
-                                n += 1
-            if (x, y, z, w) in active:
-                if n in (2, 3):
-                    new_active.add((x, y, z, w))
-            else:
-                if n == 3:
-                    new_active.add((x, y, z, w))
-        active = new_active
-
-    print(len(active))
+                plane.add((x, y))
+
+    print(simulate(plane, dims=4, cycles=6))
 
 
 if __name__ == "__main__":
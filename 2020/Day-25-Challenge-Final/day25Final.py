@@ -1,5 +1,83 @@
 import os
 import sys
+from math import isqrt
+
+MODULUS = 20201227
+SUBJECT = 7
+
+
+def factorize(n):
+    """Prime factorisation of n as a dict {prime: exponent}."""
+    factors = {}
+    p = 2
+    while p * p <= n:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+        p += 1 if p == 2 else 2
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+def multiplicative_order(g, m, group_order, factors):
+    """Order of g modulo m, given the group order and its factorisation."""
+    order = group_order
+    for p in factors:
+        while order % p == 0 and pow(g, order // p, m) == 1:
+            order //= p
+    return order
+
+
+def baby_step_giant_step(g, h, m, order):
+    """Smallest x in [0, order) with g**x == h (mod m), or None."""
+    n = isqrt(order) + 1
+    table = {}
+    value = 1
+    for j in range(n):
+        table.setdefault(value, j)
+        value = value * g % m
+    giant = pow(g, -n, m)
+    value = h
+    for i in range(n):
+        j = table.get(value)
+        if j is not None:
+            return i * n + j
+        value = value * giant % m
+    return None
+
+
+def discrete_log(g, h, m):
+    """Smallest x >= 0 with g**x == h (mod m), for a prime modulus m.
+
+    Pohlig-Hellman: the order of g is split into prime powers, each
+    digit of x in base p is found with a baby-step giant-step search in
+    the subgroup of order p, and the pieces are joined with the CRT.
+    Raises ValueError when h is not a power of g.
+    """
+    h %= m
+    factors = factorize(m - 1)
+    order = multiplicative_order(g, m, m - 1, factors)
+
+    x, modulus = 0, 1
+    for p, e in factorize(order).items():
+        # solve x mod p**e one base-p digit at a time
+        gamma = pow(g, order // p, m)
+        x_p = 0
+        for k in range(e):
+            h_k = pow(pow(g, -x_p, m) * h % m, order // p ** (k + 1), m)
+            d = baby_step_giant_step(gamma, h_k, m, p)
+            if d is None:
+                raise ValueError(f"{h} is not a power of {g} modulo {m}")
+            x_p += d * p ** k
+        # combine with the residues found so far
+        pe = p ** e
+        x += modulus * ((x_p - x) * pow(modulus, -1, pe) % pe)
+        modulus *= pe
+
+    if pow(g, x, m) != h:
+        raise ValueError(f"{h} is not a power of {g} modulo {m}")
+    return x
 
 
 def main():
@@ -10,19 +88,10 @@ def main():
         card_pk, door_pk = (int(x) for x in f.read().split())
 
     # find the card's loop size
-    subject = 7
-    value = 1
-    loop = 0
-    while value != card_pk:
-        value = (value * subject) % 20201227
-        loop += 1
+    loop = discrete_log(SUBJECT, card_pk, MODULUS)
 
     # transform the door's public key by the card's loop size
-    value = 1
-    for _ in range(loop):
-        value = (value * door_pk) % 20201227
-
-    print(value)
+    print(pow(door_pk, loop, MODULUS))
 
 
 if __name__ == "__main__":
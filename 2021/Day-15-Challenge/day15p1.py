@@ -1,6 +1,69 @@
 import os
 import sys
-import heapq
+from array import array
+
+# Marks the padding ring around the map in the risk cache
+EDGE = 255
+
+
+def lowest_total_risk(risk, w, h, max_risk=9):
+    """Lowest total risk from the top left to the bottom right of a w x h map.
+
+    risk(x, y) is called lazily, once for each cell the search reaches, and
+    cached in a padded flat bytearray (y*pw+x), so tiled maps never have
+    to be built as a grid of lists up front. A ring of EDGE bytes marks
+    the outside. Edge weights are small integers in 1..max_risk, so this
+    is Dial's algorithm: a ring of max_risk + 1 buckets indexed by
+    distance replaces the heap, and every push or pop is a list append
+    or iteration. A risk outside 1..max_risk would land in the wrong
+    bucket, so it raises ValueError when the cell is first read.
+    """
+    if not 0 < max_risk < EDGE:
+        raise ValueError(f"max_risk must be in 1..{EDGE - 1}, got {max_risk}")
+    pw = w + 2
+    cached = bytearray(pw * (h + 2))
+    cached[:pw] = cached[-pw:] = bytes([EDGE]) * pw
+    cached[::pw] = cached[pw - 1::pw] = bytes([EDGE]) * (h + 2)
+    offsets = (1, -1, pw, -pw)
+    start = pw + 1
+    goal = h * pw + w
+    inf = 1 << 62
+    dist = array('q', [inf]) * len(cached)
+    dist[start] = 0
+    ring = max_risk + 1
+    buckets = [[] for _ in range(ring)]
+    buckets[0].append(start)
+    pending = 1
+    d = 0
+    while pending:
+        slot = d % ring
+        bucket = buckets[slot]
+        if bucket:
+            buckets[slot] = []
+            pending -= len(bucket)
+            for pos in bucket:
+                if dist[pos] != d:
+                    continue
+                if pos == goal:
+                    return d
+                for off in offsets:
+                    nxt = pos + off
+                    r = cached[nxt]
+                    if r == EDGE:
+                        continue
+                    if not r:
+                        y, x = divmod(nxt, pw)
+                        r = risk(x - 1, y - 1)
+                        if not 1 <= r <= max_risk:
+                            raise ValueError(f"Risk {r} at ({x - 1}, {y - 1}) is outside 1..{max_risk}")
+                        cached[nxt] = r
+                    nd = d + r
+                    if nd < dist[nxt]:
+                        dist[nxt] = nd
+                        buckets[nd % ring].append(nxt)
+                        pending += 1
+        d += 1
+    return None
 
 
 def main():
@@ -13,22 +76,10 @@ def main():
     h = len(grid)
     w = len(grid[0])
 
-    dist = {(0, 0): 0}
-    pq = [(0, 0, 0)]
-    while pq:
-        d, x, y = heapq.heappop(pq)
-        if (x, y) == (w - 1, h - 1):
-            print(d)
-            return
-        if dist.get((x, y), 10**18) != d:
-            continue
-        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < w and 0 <= ny < h:
-                nd = d + grid[ny][nx]
-                if nd < dist.get((nx, ny), 10**18):
-                    dist[(nx, ny)] = nd
-                    heapq.heappush(pq, (nd, nx, ny))
+    def risk(x, y):
+        return grid[y][x]
+
+    print(lowest_total_risk(risk, w, h))
 
 
 if __name__ == "__main__":
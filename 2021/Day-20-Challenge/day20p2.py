@@ -2,32 +2,61 @@ import os
 import sys
 
 
-def enhance(algo, lit, steps):
+def rule_tree(algo, planes, full, level=0, prefix=0):
+    """Evaluate 'algo' over every pixel at once as a multiplexer tree.
+
+    'planes[k]' holds, for every pixel, the k-th bit of its 9-bit index
+    (most significant first); each level of the tree selects on one plane,
+    and identical sub-results are shared instead of re-muxed.
+    """
+    if level == 9:
+        return full if algo[prefix] == '#' else 0
+    lo = rule_tree(algo, planes, full, level + 1, prefix << 1)
+    hi = rule_tree(algo, planes, full, level + 1, (prefix << 1) | 1)
+    if lo == hi:
+        return lo
+    plane = planes[level]
+    return (lo & ~plane) | (hi & plane)
+
+
+def enhance(algo, grid, steps):
+    """Apply 'steps' enhancements; return the number of lit pixels.
+
+    The image lives in one big integer, bit y*w+x per pixel, padded far
+    enough that the lit region never reaches the outer ring.  The ring is
+    reset to the infinite background after every step, which keeps the
+    wrap-around of the shifted planes from leaking into the image.
+    """
+    pad = steps + 2
+    w = len(grid[0]) + 2 * pad
+    h = len(grid) + 2 * pad
+    full = (1 << (w * h)) - 1
+
+    image = 0
+    for y, row in enumerate(grid):
+        for x, c in enumerate(row):
+            if c == '#':
+                image |= 1 << ((y + pad) * w + x + pad)
+
+    interior = 0
+    row_bits = ((1 << (w - 2)) - 1) << 1
+    for y in range(1, h - 1):
+        interior |= row_bits << (y * w)
+    border = full & ~interior
+
+    offsets = [dy * w + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
     bg = 0
     for _ in range(steps):
-        xs = [p[0] for p in lit]
-        ys = [p[1] for p in lit]
-        x0, x1 = min(xs), max(xs)
-        y0, y1 = min(ys), max(ys)
-        new_lit = set()
-        for y in range(y0 - 1, y1 + 2):
-            for x in range(x0 - 1, x1 + 2):
-                idx = 0
-                for dy in (-1, 0, 1):
-                    for dx in (-1, 0, 1):
-                        idx <<= 1
-                        px, py = x + dx, y + dy
-                        if (px, py) in lit:
-                            idx |= 1
-                        elif not (x0 <= px <= x1 and y0 <= py <= y1):
-                            # outside the known grid: the background
-                            if bg == 1:
-                                idx |= 1
-                if algo[idx] == '#':
-                    new_lit.add((x, y))
-        lit = new_lit
-        bg = 1 - bg if algo[0] == '#' else 0
-    return lit
+        planes = [(image >> off) if off >= 0 else ((image << -off) & full)
+                  for off in offsets]
+        image = rule_tree(algo, planes, full)
+        bg = (algo[511] if bg else algo[0]) == '#'
+        image = (image & interior) | (border if bg else 0)
+
+    if bg:
+        raise ValueError("infinitely many pixels are lit")
+    return bin(image).count('1')
 
 
 def main():
@@ -40,13 +69,7 @@ def main():
     algo = lines[0]
     grid = [line for line in lines[1:] if line]
 
-    lit = set()
-    for y, row in enumerate(grid):
-        for x, c in enumerate(row):
-            if c == '#':
-                lit.add((x, y))
-
-    print(len(enhance(algo, lit, 50)))
+    print(enhance(algo, grid, 50))
 
 
 if __name__ == "__main__":
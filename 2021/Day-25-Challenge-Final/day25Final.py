@@ -2,25 +2,65 @@ import os
 import sys
 
 
-def step(grid, h, w):
-    # east-facing first
-    moved = False
-    new = [row[:] for row in grid]
-    for y in range(h):
-        for x in range(w):
-            if grid[y][x] == '>' and grid[y][(x + 1) % w] == '.':
-                new[y][x] = '.'
-                new[y][(x + 1) % w] = '>'
-                moved = True
-    grid = new
-    new = [row[:] for row in grid]
-    for y in range(h):
-        for x in range(w):
-            if grid[y][x] == 'v' and grid[(y + 1) % h][x] == '.':
-                new[y][x] = '.'
-                new[(y + 1) % h][x] = 'v'
-                moved = True
-    return new, moved
+def make_step(h, w):
+    """Build a step function for an h x w torus.
+
+    Each herd is one big integer with bit y*w+x set per cucumber, so a
+    whole herd moves with a few shifts and masks; the wrap-around column
+    and row are rotated back in explicitly.
+    """
+    full = (1 << (h * w)) - 1
+    first_col = sum(1 << (y * w) for y in range(h))
+    last_col = first_col << (w - 1)
+    last_row_shift = w * (h - 1)
+    last_row = ((1 << w) - 1) << last_row_shift
+
+    def east(b):
+        return (((b & ~last_col) << 1) | ((b & last_col) >> (w - 1)))
+
+    def west(b):
+        return (((b & ~first_col) >> 1) | ((b & first_col) << (w - 1)))
+
+    def south(b):
+        return (((b & ~last_row) << w) | (b >> last_row_shift))
+
+    def north(b):
+        return ((b >> w) | ((b & ((1 << w) - 1)) << last_row_shift))
+
+    def step(state):
+        east_herd, south_herd = state
+        # east-facing first
+        dest = east(east_herd) & ~(east_herd | south_herd) & full
+        east_herd = (east_herd & ~west(dest)) | dest
+        dest = south(south_herd) & ~(east_herd | south_herd) & full
+        south_herd = (south_herd & ~north(dest)) | dest
+        return east_herd, south_herd
+
+    return step
+
+
+def run_until_fixed(step, state, key=None):
+    """Apply 'step' until the state stops changing.
+
+    Returns (steps, state) where 'steps' counts the first step that left
+    the state unchanged.  With 'key' the states are compared through
+    key(state) (e.g. a hash), and a repeat of an earlier key that is not
+    a fixed point raises ValueError instead of looping forever.
+    """
+    seen = set()
+    current = key(state) if key else state
+    steps = 0
+    while True:
+        steps += 1
+        state = step(state)
+        nxt = key(state) if key else state
+        if nxt == current:
+            return steps, state
+        if key:
+            if nxt in seen:
+                raise ValueError("state entered a cycle without settling")
+            seen.add(current)
+        current = nxt
 
 
 def main():
@@ -28,17 +68,20 @@ def main():
         os.path.dirname(os.path.abspath(__file__)), "input.txt")
 
     with open(input_file, 'r') as f:
-        grid = [list(line.strip()) for line in f if line.strip()]
+        grid = [line.strip() for line in f if line.strip()]
 
     h = len(grid)
     w = len(grid[0])
-    steps = 0
-    while True:
-        steps += 1
-        grid, moved = step(grid, h, w)
-        if not moved:
-            print(steps)
-            return
+    east_herd = south_herd = 0
+    for y, row in enumerate(grid):
+        for x, c in enumerate(row):
+            if c == '>':
+                east_herd |= 1 << (y * w + x)
+            elif c == 'v':
+                south_herd |= 1 << (y * w + x)
+
+    steps, _ = run_until_fixed(make_step(h, w), (east_herd, south_herd))
+    print(steps)
 
 
 if __name__ == "__main__":
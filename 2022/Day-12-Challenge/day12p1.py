@@ -1,6 +1,56 @@
 import os
 import sys
-import heapq
+from array import array
+
+# Elevation of the padding ring around the map: never reachable
+WALL = 255
+
+
+def flatten_grid(grid):
+    """Pack the height map into a flat bytearray, y*w+x with padding.
+
+    Returns (elev, w, marks) where 'w' is the padded width, the outer ring
+    holds WALL, and 'marks' maps each letter in "SE" plus 'a' to the flat
+    indices where it appears.
+    """
+    w = len(grid[0]) + 2
+    elev = bytearray([WALL]) * (w * (len(grid) + 2))
+    marks = {'S': [], 'E': [], 'a': []}
+    for y, row in enumerate(grid, 1):
+        for x, c in enumerate(row, 1):
+            pos = y * w + x
+            if c in marks:
+                marks[c].append(pos)
+            if c == 'S':
+                c = 'a'
+            elif c == 'E':
+                c = 'z'
+            elev[pos] = ord(c) - ord('a')
+    return elev, w, marks
+
+
+def bfs(elev, w, start, end):
+    """Fewest steps from 'start' to 'end', climbing at most one level a step."""
+    offsets = (1, -1, w, -w)
+    dist = array('i', [-1]) * len(elev)
+    dist[start] = 0
+    frontier = [start]
+    steps = 0
+    while frontier:
+        if dist[end] >= 0:
+            return dist[end]
+        steps += 1
+        next_frontier = []
+        for pos in frontier:
+            limit = elev[pos] + 1
+            for off in offsets:
+                nxt = pos + off
+                # WALL is above any limit, so the padding is never entered
+                if elev[nxt] <= limit and dist[nxt] < 0:
+                    dist[nxt] = steps
+                    next_frontier.append(nxt)
+        frontier = next_frontier
+    return -1
 
 
 def main():
@@ -9,40 +59,8 @@ def main():
     with open(input_file, 'r') as f:
         grid = [l.strip() for l in f if l.strip()]
 
-    h, w = len(grid), len(grid[0])
-    start = end = None
-    for y in range(h):
-        for x in range(w):
-            if grid[y][x] == 'S':
-                start = (x, y)
-            elif grid[y][x] == 'E':
-                end = (x, y)
-
-    def elev(c):
-        if c == 'S':
-            return 0
-        if c == 'E':
-            return 25
-        return ord(c) - ord('a')
-
-    dist = {start: 0}
-    pq = [(0, start)]
-    while pq:
-        d, (x, y) = heapq.heappop(pq)
-        if dist.get((x, y)) != d:
-            continue
-        if (x, y) == end:
-            print(d)
-            return
-        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < w and 0 <= ny < h:
-                if elev(grid[ny][nx]) <= elev(grid[y][x]) + 1:
-                    nd = d + 1
-                    if nd < dist.get((nx, ny), 10**18):
-                        dist[(nx, ny)] = nd
-                        heapq.heappush(pq, (nd, (nx, ny)))
-    print(-1)
+    elev, w, marks = flatten_grid(grid)
+    print(bfs(elev, w, marks['S'][0], marks['E'][0]))
 
 
 if __name__ == "__main__":
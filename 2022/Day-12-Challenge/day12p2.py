@@ -1,6 +1,58 @@
 import os
 import sys
-import heapq
+from array import array
+
+# Elevation of the padding ring around the map: never reachable
+WALL = 255
+
+
+def flatten_grid(grid):
+    """Pack the height map into a flat bytearray, y*w+x with padding.
+
+    Returns (elev, w, marks) where 'w' is the padded width, the outer ring
+    holds WALL, and 'marks' maps each letter in "SE" plus 'a' to the flat
+    indices where it appears.
+    """
+    w = len(grid[0]) + 2
+    elev = bytearray([WALL]) * (w * (len(grid) + 2))
+    marks = {'S': [], 'E': [], 'a': []}
+    for y, row in enumerate(grid, 1):
+        for x, c in enumerate(row, 1):
+            pos = y * w + x
+            if c in marks:
+                marks[c].append(pos)
+            if c == 'S':
+                c = 'a'
+            elif c == 'E':
+                c = 'z'
+            elev[pos] = ord(c) - ord('a')
+    return elev, w, marks
+
+
+def bfs_descent(elev, w, end):
+    """Steps from every cell to 'end', walking backwards from 'end'.
+
+    Going backwards a step may drop any amount but climb at most one.
+    Returns the flat distance array (-1 where 'end' is unreachable).
+    """
+    offsets = (1, -1, w, -w)
+    dist = array('i', [-1]) * len(elev)
+    dist[end] = 0
+    frontier = [end]
+    steps = 0
+    while frontier:
+        steps += 1
+        next_frontier = []
+        for pos in frontier:
+            floor = elev[pos] - 1
+            for off in offsets:
+                nxt = pos + off
+                h = elev[nxt]
+                if floor <= h != WALL and dist[nxt] < 0:
+                    dist[nxt] = steps
+                    next_frontier.append(nxt)
+        frontier = next_frontier
+    return dist
 
 
 def main():
@@ -9,42 +61,12 @@ def main():
     with open(input_file, 'r') as f:
         grid = [l.strip() for l in f if l.strip()]
 
-    h, w = len(grid), len(grid[0])
-    end = None
-    starts = []
-    for y in range(h):
-        for x in range(w):
-            if grid[y][x] == 'S':
-                starts.append((x, y))
-            elif grid[y][x] == 'E':
-                end = (x, y)
-            elif grid[y][x] == 'a':
-                starts.append((x, y))
-
-    def elev(c):
-        if c == 'S':
-            return 0
-        if c == 'E':
-            return 25
-        return ord(c) - ord('a')
+    elev, w, marks = flatten_grid(grid)
 
     # BFS from end going backwards (descent)
-    dist = {end: 0}
-    q = [end]
-    from collections import deque
-    q = deque([end])
-    while q:
-        x, y = q.popleft()
-        d = dist[(x, y)]
-        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < w and 0 <= ny < h:
-                if elev(grid[y][x]) <= elev(grid[ny][nx]) + 1:
-                    if (nx, ny) not in dist:
-                        dist[(nx, ny)] = d + 1
-                        q.append((nx, ny))
-
-    best = min(dist[s] for s in starts if s in dist)
+    dist = bfs_descent(elev, w, marks['E'][0])
+
+    best = min(dist[s] for s in marks['S'] + marks['a'] if dist[s] >= 0)
     print(best)
 
 
@@ -4,6 +4,64 @@ import sys
 KEY = 811589153
 
 
+class BlockList:
+    """Sequence of ids split into ~sqrt(n) blocks.
+
+    'block_of[id]' says which block holds an id, so an element is found,
+    removed and re-inserted in O(sqrt n) instead of scanning the whole list.
+    All blocks are re-balanced once any of them grows to twice the
+    target size; emptied blocks are harmless and simply skipped over.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.size = max(1, int(n ** 0.5))
+        self.rebuild(list(range(n)))
+
+    def rebuild(self, order):
+        size = self.size
+        self.blocks = [order[i:i + size] for i in range(0, len(order), size)]
+        self.block_of = [0] * self.n
+        for b, block in enumerate(self.blocks):
+            for i in block:
+                self.block_of[i] = b
+
+    def order(self):
+        return [i for block in self.blocks for i in block]
+
+    def move(self, i, shift):
+        """Move id 'i' by 'shift' places around the circle."""
+        blocks = self.blocks
+        b = self.block_of[i]
+        block = blocks[b]
+        at = block.index(i)
+        pos = sum(map(len, blocks[:b])) + at
+        del block[at]
+
+        new_pos = (pos + shift) % (self.n - 1)
+        for nb, target in enumerate(blocks):
+            if new_pos <= len(target):
+                target.insert(new_pos, i)
+                self.block_of[i] = nb
+                break
+            new_pos -= len(target)
+
+        if len(target) > 2 * self.size:
+            self.rebuild(self.order())
+
+
+def mix(nums, rounds):
+    """Mix 'nums' 'rounds' times; return the values in final order."""
+    n = len(nums)
+    if n < 2:
+        return list(nums)
+    order = BlockList(n)
+    for _ in range(rounds):
+        for i, v in enumerate(nums):
+            order.move(i, v)
+    return [nums[i] for i in order.order()]
+
+
 def main():
     input_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
         os.path.dirname(os.path.abspath(__file__)), "input.txt")
@@ -11,16 +69,7 @@ def main():
         nums = [int(l.strip()) * KEY for l in f if l.strip()]
 
     n = len(nums)
-    items = list(enumerate(nums))
-    for _ in range(10):
-        for i in range(n):
-            pos = next(j for j, (oi, v) in enumerate(items) if oi == i)
-            _, v = items[pos]
-            del items[pos]
-            new_pos = (pos + v) % (n - 1)
-            items.insert(new_pos, (i, v))
-
-    vals = [v for _, v in items]
+    vals = mix(nums, 10)
     zi = vals.index(0)
     a = vals[(zi + 1000) % n]
     b = vals[(zi + 2000) % n]
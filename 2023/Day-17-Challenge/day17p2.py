@@ -1,6 +1,91 @@
 import os
 import sys
-import heapq
+from array import array
+
+# Crucible limits: must move MIN_RUN blocks before turning or stopping,
+# and may move at most MAX_RUN blocks in a straight line
+MIN_RUN = 4
+MAX_RUN = 10
+
+
+def flatten_grid(rows):
+    """Pack a grid of heat-loss digits into a flat bytearray, y*w+x with padding.
+
+    A ring of zero cells surrounds the grid, so a neighbour is always
+    index + offset and a zero weight marks "outside" without bounds checks.
+    Grid weights must be in 1..255, raising ValueError otherwise.
+    Returns (weights, w) where w is the padded width.
+    """
+    w = len(rows[0]) + 2
+    weights = bytearray(w * (len(rows) + 2))
+    for y, row in enumerate(rows, 1):
+        for x, loss in enumerate(row):
+            if not 1 <= loss <= 255:
+                raise ValueError(f"Heat loss {loss} at ({x}, {y - 1}) is outside 1..255")
+        weights[y * w + 1:y * w + 1 + len(row)] = bytes(row)
+    return weights, w
+
+
+def min_heat_loss(weights, w, start, goal):
+    """Least heat loss from 'start' to 'goal' (flat indices), or -1.
+
+    A state (pos, dir, straight) is one int, (pos * 5 + dir) * (MAX_RUN + 1)
+    + straight, with dir 4 meaning "not moved yet", and distances live in a
+    flat array. Every move costs 1..max(weights), so the frontier is a
+    ring of max(weights) + 1 buckets indexed by distance (Dial's algorithm)
+    instead of a heap.
+    """
+    # dir: 0=R,1=D,2=L,3=U
+    offsets = (1, w, -1, -w)
+    runs = MAX_RUN + 1
+    n_states = len(weights) * 5 * runs
+    inf = 1 << 62
+    dist = array('q', [inf]) * n_states
+    start_state = (start * 5 + 4) * runs
+    dist[start_state] = 0
+    ring = max(weights) + 1
+    buckets = [[] for _ in range(ring)]
+    buckets[0].append(start_state)
+    pending = 1
+    d = 0
+    while pending:
+        slot = d % ring
+        bucket = buckets[slot]
+        if not bucket:
+            d += 1
+            continue
+        buckets[slot] = []
+        pending -= len(bucket)
+        for state in bucket:
+            if dist[state] != d:
+                continue
+            rest, st = divmod(state, runs)
+            pos, dr = divmod(rest, 5)
+            if pos == goal and st >= MIN_RUN:
+                return d
+            for nd in range(4):
+                if dr != 4 and (nd + 2) % 4 == dr:
+                    continue  # no reversing
+                if nd == dr:
+                    if st >= MAX_RUN:
+                        continue
+                    nst = st + 1
+                else:
+                    if dr != 4 and st < MIN_RUN:
+                        continue
+                    # turn: reset straight
+                    nst = 1
+                nxt = pos + offsets[nd]
+                loss = weights[nxt]
+                if loss:
+                    ndist = d + loss
+                    nstate = (nxt * 5 + nd) * runs + nst
+                    if ndist < dist[nstate]:
+                        dist[nstate] = ndist
+                        buckets[ndist % ring].append(nstate)
+                        pending += 1
+        d += 1
+    return -1
 
 
 def main():
@@ -10,37 +95,8 @@ def main():
         grid = [[int(c) for c in l.strip()] for l in f if l.strip()]
 
     h, w = len(grid), len(grid[0])
-    dx = [1, 0, -1, 0]
-    dy = [0, 1, 0, -1]
-    start = (0, 0, -1, 0)
-    dist = {start: 0}
-    pq = [(0, start)]
-    while pq:
-        d, (x, y, dr, st) = heapq.heappop(pq)
-        if dist.get((x, y, dr, st)) != d:
-            continue
-        if (x, y) == (w - 1, h - 1) and st >= 4:
-            print(d)
-            return
-        for nd in range(4):
-            if dr != -1 and (nd + 2) % 4 == dr:
-                continue
-            if nd == dr:
-                if st >= 10:
-                    continue
-                nst = st + 1
-            else:
-                if dr != -1 and st < 4:
-                    continue
-                nst = 1
-            nx, ny = x + dx[nd], y + dy[nd]
-            if 0 <= nx < w and 0 <= ny < h:
-                ndist = d + grid[ny][nx]
-                nstate = (nx, ny, nd, nst)
-                if ndist < dist.get(nstate, 10**18):
-                    dist[nstate] = ndist
-                    heapq.heappush(pq, (ndist, nstate))
-    print(-1)
+    weights, pw = flatten_grid(grid)
+    print(min_heat_loss(weights, pw, 1 * pw + 1, h * pw + w))
 
 
 if __name__ == "__main__":
@@ -1,71 +1,65 @@
 import os
+from array import array
 with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt"), "r") as file:
     lines = file.readlines()
-final_grid = [[""]*(len(lines)) for _ in range(len(lines[0]) - 1)]
 
-moves = []
-row = 0
+grid = []
 for line in lines: #  format
     if "#" in line[0]:
-        line = line.split("\n")[0]
-        col = 0
-        for i in line:
-            final_grid[row][col] = i
-            col += 1
-        row += 1
-    
-# print(final_grid)
+        grid.append(line.split("\n")[0])
 
+# Flat grid: cell (row, col) lives at index row * width + col, 1 = open, 0 = wall.
+# The maze is ringed by walls, so a neighbour is always cell + offset with no bounds checks.
+width = len(grid[0])
+open_cells = bytearray(width * len(grid))
 # Find start (S) and end (E) positions
 start = None
 end = None
-for row in range(len(final_grid)):
-    for col in range(len(final_grid[0])):
-        if final_grid[row][col] == 'S':
-            start = (row, col)
-        elif final_grid[row][col] == 'E':
-            end = (row, col)
+for row in range(len(grid)):
+    for col in range(width):
+        if grid[row][col] != '#':
+            open_cells[row * width + col] = 1
+        if grid[row][col] == 'S':
+            start = row * width + col
+        elif grid[row][col] == 'E':
+            end = row * width + col
 
 # Directions: 0=North, 1=East, 2=South, 3=West
 # Starting facing East as per problem statement
 import heapq # Priority queue
-directions = [(-1,0),(0,1),(1,0),(0,-1)]
-start_state = (start[0], start[1], 1)  # row, col, direction
+offsets = (-width, 1, width, -1)
+# A state (cell, dir) is the single int cell * 4 + dir, so distances fit a flat array
+# and heap entries are the int (cost << shift) | state instead of tuples
+start_state = start * 4 + 1
+state_count = len(open_cells) * 4
+shift = state_count.bit_length()
+mask = (1 << shift) - 1
+unreached = 1 << 62
 
 # Dijkstra's algorithm using a priority queue
-dist = {}
+dist = array('q', [unreached]) * state_count
 dist[start_state] = 0
-priority_queue = [(0, start_state)] # priority queue, keeps cheapest on top
+priority_queue = [start_state] # priority queue, keeps cheapest on top
 
 while priority_queue:
-    current_cost, (row, col, dir) = heapq.heappop(priority_queue)
-    if (row, col) == end: # if no cheaper ways to get to end, solution found.
+    entry = heapq.heappop(priority_queue)
+    current_cost = entry >> shift
+    state = entry & mask
+    cell, dir = state >> 2, state & 3
+    if cell == end: # if no cheaper ways to get to end, solution found.
         print(current_cost)
         break
-    if current_cost > dist[(row, col, dir)]:
+    if current_cost > dist[state]:
         continue
-    # Move forward
-    new_row, new_col = row + directions[dir][0], col + directions[dir][1]
-    if 0 <= new_row < len(final_grid) and 0 <= new_col < len(final_grid[0]) and final_grid[new_row][new_col] != '#':
-        new_cost = current_cost + 1
-        new_state = (new_row, new_col, dir)
-        if new_state not in dist or new_cost < dist[new_state]:
+    # Move forward, then turn left and right
+    new_cell = cell + offsets[dir]
+    moves = [(new_cell * 4 + dir, current_cost + 1)] if open_cells[new_cell] else []
+    moves.append((cell * 4 + (dir - 1) % 4, current_cost + 1000))
+    moves.append((cell * 4 + (dir + 1) % 4, current_cost + 1000))
+    for new_state, new_cost in moves:
+        if new_cost < dist[new_state]:
             dist[new_state] = new_cost
-            heapq.heappush(priority_queue, (new_cost, new_state))
-    # Turn left
-    new_dir = (dir - 1) % 4
-    new_cost = current_cost + 1000
-    new_state = (row, col, new_dir)
-    if new_state not in dist or new_cost < dist[new_state]:
-        dist[new_state] = new_cost
-        heapq.heappush(priority_queue, (new_cost, new_state))
-    # Turn right
-    new_dir = (dir + 1) % 4
-    new_cost = current_cost + 1000
-    new_state = (row, col, new_dir)
-    if new_state not in dist or new_cost < dist[new_state]:
-        dist[new_state] = new_cost
-        heapq.heappush(priority_queue, (new_cost, new_state))
+            heapq.heappush(priority_queue, (new_cost << shift) | new_state)
     
 
 # n = number of states processed (nodes explored in the priority queue)
@@ -81,8 +75,8 @@ while priority_queue:
 # Total: O(m + n log n) so O(n log n)
 
 # Space Complexity:
-# Storing the Grid: O(m)
-# Storing the Distances Dictionary: O(n)
+# Storing the Grid: O(m) (one byte per cell)
+# Storing the Distance Array: O(m) (4 states per cell)
 # Storing the Priority Queue: O(n)
 # Temporary Variables: O(1)
 # Total: O(m + n)
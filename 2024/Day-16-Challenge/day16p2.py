@@ -1,102 +1,91 @@
 import os
+from array import array
 with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt"), "r") as file:
     lines = file.readlines()
-final_grid = [[""]*(len(lines)) for _ in range(len(lines[0]) - 1)]
 
-moves = []
-row = 0
+grid = []
 for line in lines: #  format
     if "#" in line[0]:
-        line = line.split("\n")[0]
-        col = 0
-        for i in line:
-            final_grid[row][col] = i
-            col += 1
-        row += 1
-    
-# print(final_grid)
+        grid.append(line.split("\n")[0])
 
+# Flat grid: cell (row, col) lives at index row * width + col, 1 = open, 0 = wall.
+# The maze is ringed by walls, so a neighbour is always cell + offset with no bounds checks.
+width = len(grid[0])
+open_cells = bytearray(width * len(grid))
 # Find start (S) and end (E) positions
 start = None
 end = None
-for row in range(len(final_grid)):
-    for col in range(len(final_grid[0])):
-        if final_grid[row][col] == 'S':
-            start = (row, col)
-        elif final_grid[row][col] == 'E':
-            end = (row, col)
+for row in range(len(grid)):
+    for col in range(width):
+        if grid[row][col] != '#':
+            open_cells[row * width + col] = 1
+        if grid[row][col] == 'S':
+            start = row * width + col
+        elif grid[row][col] == 'E':
+            end = row * width + col
 
 # Directions: 0=North, 1=East, 2=South, 3=West
 # Starting facing East as per problem statement
 import heapq # Priority queue
-directions = [(-1,0),(0,1),(1,0),(0,-1)]
-start_state = (start[0], start[1], 1)  # row, col, direction
-
-# Track predecessors for backtracking
-previous_states = {}
-
-# Modified Dijkstra's algorithm to track all paths
-distances = {}
+offsets = (-width, 1, width, -1)
+# A state (cell, dir) is the single int cell * 4 + dir, so distances fit a flat array
+# and heap entries are the int (cost << shift) | state instead of tuples
+start_state = start * 4 + 1
+state_count = len(open_cells) * 4
+shift = state_count.bit_length()
+mask = (1 << shift) - 1
+unreached = 1 << 62
+
+# Dijkstra's algorithm over every state (no early exit, all best paths are needed)
+distances = array('q', [unreached]) * state_count
 distances[start_state] = 0
-priority_queue = [(0, start_state)]
-previous_states[start_state] = [] # useful when backtracking
+priority_queue = [start_state]
 
 while priority_queue:
-    current_cost, (row, col, dir) = heapq.heappop(priority_queue)
-    if distances[(row, col, dir)] < current_cost:
+    entry = heapq.heappop(priority_queue)
+    current_cost = entry >> shift
+    state = entry & mask
+    if distances[state] < current_cost:
         continue
-    # Move forward
-    new_row, new_col = row + directions[dir][0], col + directions[dir][1]
-    if 0 <= new_row < len(final_grid) and 0 <= new_col < len(final_grid[0]) and final_grid[new_row][new_col] != '#':
-        new_cost = current_cost + 1
-        new_state = (new_row, new_col, dir)
-        if new_state not in distances or new_cost < distances[new_state]:
+    cell, dir = state >> 2, state & 3
+    # Move forward, then turn left and right
+    new_cell = cell + offsets[dir]
+    moves = [(new_cell * 4 + dir, current_cost + 1)] if open_cells[new_cell] else []
+    moves.append((cell * 4 + (dir - 1) % 4, current_cost + 1000))
+    moves.append((cell * 4 + (dir + 1) % 4, current_cost + 1000))
+    for new_state, new_cost in moves:
+        if new_cost < distances[new_state]:
             distances[new_state] = new_cost
-            heapq.heappush(priority_queue, (new_cost, new_state))
-            previous_states[new_state] = [(row, col, dir)]
-        elif new_cost == distances[new_state]:
-            previous_states[new_state].append((row, col, dir))
-    # Turn left
-    new_dir = (dir - 1) % 4
-    new_cost = current_cost + 1000
-    new_state = (row, col, new_dir)
-    if new_state not in distances or new_cost < distances[new_state]:
-        distances[new_state] = new_cost
-        heapq.heappush(priority_queue, (new_cost, new_state))
-        previous_states[new_state] = [(row, col, dir)]
-    elif new_cost == distances[new_state]:
-        previous_states[new_state].append((row, col, dir))
-    # Turn right
-    new_dir = (dir + 1) % 4
-    new_cost = current_cost + 1000
-    new_state = (row, col, new_dir)
-    if new_state not in distances or new_cost < distances[new_state]:
-        distances[new_state] = new_cost
-        heapq.heappush(priority_queue, (new_cost, new_state))
-        previous_states[new_state] = [(row, col, dir)]
-    elif new_cost == distances[new_state]:
-        previous_states[new_state].append((row, col, dir))
-
-# Backtrack to find all tiles part of the best paths
-end_states = []
-for state in distances:
-    row, col, _ = state
-    if (row, col) == end:
-        end_states.append(state)
-tiles_in_best_paths = set()
-
-def backtrack(state):
-    row, col, _ = state
-    tiles_in_best_paths.add((row, col))
-    for parent in previous_states.get(state, []): # in case it intersects, multiple parents.
-        # get() avoids KeyError and returns empty list if not exist
-        backtrack(parent)
-
-for end_state in end_states:
-    backtrack(end_state)
+            heapq.heappush(priority_queue, (new_cost << shift) | new_state)
+
+# Backtrack to find all tiles part of the best paths.
+# Instead of storing predecessor lists, walk the moves in reverse: a parent lies
+# on a best path exactly when its distance plus the move cost equals the child's.
+best_cost = min(distances[end * 4:end * 4 + 4])
+end_states = [end * 4 + dir for dir in range(4) if distances[end * 4 + dir] == best_cost < unreached]
+tiles_in_best_paths = bytearray(len(open_cells))
+seen = bytearray(state_count)
+stack = end_states # iterative, in case paths intersect (multiple parents)
+for state in end_states:
+    seen[state] = 1
+while stack:
+    state = stack.pop()
+    cell, dir = state >> 2, state & 3
+    tiles_in_best_paths[cell] = 1
+    cost = distances[state]
+    if state == start_state:
+        continue
+    prev_cell = cell - offsets[dir]
+    parents = [(prev_cell * 4 + dir, cost - 1)] if open_cells[prev_cell] else []
+    parents.append((cell * 4 + (dir - 1) % 4, cost - 1000))
+    parents.append((cell * 4 + (dir + 1) % 4, cost - 1000))
+    for parent, parent_cost in parents:
+        if distances[parent] == parent_cost and not seen[parent]:
+            seen[parent] = 1
+            stack.append(parent)
 
 # Count tiles part of the best paths
-best_path_count = len(tiles_in_best_paths)
+best_path_count = tiles_in_best_paths.count(1)
 
 print(best_path_count)
 
@@ -110,13 +99,12 @@ print(best_path_count)
 # Reading Input: O(m)
 # Finding Start/End: O(m)
 # Dijkstra's Algorithm: O(n log n)
-# Backtracking: O(p)
+# Backtracking: O(p) (each state visited once)
 # Total: O(m + n log n + p) so O(n log n)
 
 # Space Complexity:
-# Grid Storage: O(m)
-# Distances Dictionary: O(n)
+# Grid Storage: O(m) (one byte per cell)
+# Distances Array: O(m) (4 states per cell)
 # Priority Queue: O(n)
-# Previous States: O(n)
-# Best Path Tiles: O(p)
-# Total: O(m + n + p)
+# Best Path Tiles and Seen States: O(m)
+# Total: O(m + n)
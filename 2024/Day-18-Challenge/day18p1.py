@@ -1,38 +1,46 @@
 import os
+from array import array
 from collections import deque
 with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt"), "r") as file:
     lines = file.readlines()
 
-final_grid = [['.' for _ in range(70 + 1)] for _ in range(70 + 1)]
+SIZE = 70 + 1
+WIDTH = SIZE + 2 # one wall column on each side, so no bounds checks are needed
+
+# Flat grid: cell (x, y) lives at index (y + 1) * WIDTH + (x + 1), 1 = open, 0 = wall/corrupted
+open_cells = bytearray(WIDTH * WIDTH)
+for y in range(SIZE):
+    row_start = (y + 1) * WIDTH + 1
+    open_cells[row_start:row_start + SIZE] = b'\x01' * SIZE
 
 # Mark corrupted memory locations
 for i in range(1024):
     coords = lines[i].strip().split(',')
     x = int(coords[0])
     y = int(coords[1])
-    final_grid[y][x] = '#'
+    open_cells[(y + 1) * WIDTH + (x + 1)] = 0
 
 
-start = (0, 0) # no need to search like day 16.
-end = (70, 70)
+start = 1 * WIDTH + 1 # (0, 0), no need to search like day 16.
+end = SIZE * WIDTH + SIZE # (70, 70)
 
 # Breadth-first search (BFS) for shortest path
-directions = [(-1, 0), (1, 0), (0, -1), (0, 1)] # up down left right
-dist = [[-1] * (70 + 1) for _ in range(70 + 1)]
-dist[start[0]][start[1]] = 0
+offsets = (-WIDTH, WIDTH, -1, 1) # up down left right
+dist = array('i', [-1]) * len(open_cells)
+dist[start] = 0
 queue = deque([start])
 # similar to day 16 code
 while queue:
-    row, col = queue.popleft()
-    if (row, col) == end:
-        print(dist[row][col])
+    cell = queue.popleft()
+    if cell == end:
+        print(dist[cell])
         break
-    for dir_row, dir_col in directions:
-        new_row, new_col = row + dir_row, col + dir_col
-        if 0 <= new_row < 71 and 0 <= new_col < 71 and \
-            final_grid[new_row][new_col] != '#' and dist[new_row][new_col] == -1: #not visited too
-            dist[new_row][new_col] = dist[row][col] + 1
-            queue.append((new_row, new_col))
+    next_dist = dist[cell] + 1
+    for offset in offsets:
+        new_cell = cell + offset
+        if open_cells[new_cell] and dist[new_cell] == -1: # not a wall and not visited
+            dist[new_cell] = next_dist
+            queue.append(new_cell)
 
 
 # n = number of nodes processed (cells explored in the queue)
@@ -47,8 +55,7 @@ while queue:
 # Total: O(m + n)
 
 # Space Complexity:
-# Storing the Grid: O(m)
+# Storing the Grid: O(m) (one byte per cell)
 # Storing the Distance Array: O(m)
 # Storing the BFS Queue: O(n)
 # Total: O(m)
-
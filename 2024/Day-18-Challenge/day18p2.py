@@ -1,24 +1,28 @@
 import os
 from collections import deque
+from array import array
 with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt"), "r") as file:
     lines = file.readlines()
 
-def is_path_possible(grid, start, end):
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+SIZE = 70 + 1
+WIDTH = SIZE + 2 # one wall column on each side, so no bounds checks are needed
+
+def is_path_possible(fall_time, start, end, mid):
+    # A cell is open while its byte has not fallen yet, i.e. fall_time[cell] > mid
+    offsets = (-WIDTH, WIDTH, -1, 1)
     queue = deque([start])
-    visited = set()
-    visited.add(start)
+    visited = bytearray(len(fall_time))
+    visited[start] = 1
     # similar to day 16 code :)
     while queue:
-        row, col = queue.popleft()
-        if (row, col) == end:
+        cell = queue.popleft()
+        if cell == end:
             return True
-        for dir_row, dir_col in directions:
-            new_row, new_col = row + dir_row, col + dir_col
-            if 0 <= new_row < 71 and 0 <= new_col < 71 and \
-                grid[new_row][new_col] != '#' and (new_row, new_col) not in visited:
-                visited.add((new_row, new_col))
-                queue.append((new_row, new_col))
+        for offset in offsets:
+            new_cell = cell + offset
+            if fall_time[new_cell] > mid and not visited[new_cell]:
+                visited[new_cell] = 1
+                queue.append(new_cell)
     return False
 
 
@@ -30,9 +34,20 @@ for line in lines:
     y = int(coords[1])
     bytes_to_fall.append((x, y))
 
-final_grid = [['.' for _ in range(70 + 1)] for _ in range(70 + 1)]
-start = (0, 0) # no need to search like day 16.
-end = (70, 70)
+# Flat grid built once: fall_time[cell] is the index of the first byte landing
+# on the cell (len(bytes_to_fall) if none ever does) and -1 on the padding ring,
+# so no grid has to be reset or re-applied between binary search steps.
+never = len(bytes_to_fall)
+fall_time = array('i', [-1]) * (WIDTH * WIDTH)
+for y in range(SIZE):
+    row_start = (y + 1) * WIDTH + 1
+    fall_time[row_start:row_start + SIZE] = array('i', [never]) * SIZE
+for i in range(len(bytes_to_fall) - 1, -1, -1):
+    x, y = bytes_to_fall[i]
+    fall_time[(y + 1) * WIDTH + (x + 1)] = i
+
+start = 1 * WIDTH + 1 # (0, 0), no need to search like day 16.
+end = SIZE * WIDTH + SIZE # (70, 70)
 
 # Binary search to find the first blocking byte
 # log n complexity instead of n if linear search.
@@ -43,17 +58,8 @@ blocking_index = -1
 while low <= high:
     mid = (low + high) // 2
 
-    # Reset the grid
-    final_grid = [['.' for _ in range(70 + 1)] for _ in range(70 + 1)]
-
-
-    # Apply bytes up to mid
-    for i in range(mid + 1):
-        x, y = bytes_to_fall[i]
-        final_grid[y][x] = '#'
-
-    # Check if the path is still possible
-    if is_path_possible(final_grid, start, end):
+    # Check if the path is still possible with bytes up to mid fallen
+    if is_path_possible(fall_time, start, end, mid):
         low = mid + 1  # Path is still possible, search later bytes
     else:
         blocking_index = mid
@@ -69,17 +75,15 @@ if blocking_index != -1:
 
 # Time Complexity:
 # Reading Input: O(n)
-# Initializing the Grid: O(m) per reset, called O(log n) times
+# Building the Fall-Time Grid: O(m + n), once
 # Binary Search Iterations: O(log n)
-#   - Resetting the Grid: O(m) per iteration
-#   - Applying Bytes to Grid: O(n) per iteration
 #   - BFS Path Check (is_path_possible): O(m)
-# Total per iteration: O(m + n)
-# Total: O((m + n) * log n)
+# Total per iteration: O(m)
+# Total: O(n + m * log n)
 
 # Space Complexity:
-# Storing the Grid: O(m)
-# Storing the Visited Set (BFS): O(m)
+# Storing the Fall-Time Grid: O(m)
+# Storing the Visited Bytes (BFS): O(m)
 # BFS Queue: O(m)
 # Temporary Variables: O(1)
 # Total: O(m)
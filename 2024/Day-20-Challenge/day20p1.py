@@ -1,55 +1,62 @@
 import os
+from array import array
 from collections import deque
 with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt"), "r") as file:  
     lines = file.readlines()
 
 grid = []
 for line in lines:
-    grid.append(list(line.strip()))
+    grid.append(line.strip())
 
 rows = len(grid)
 cols = len(grid[0])
 
+# Flat grid padded by PAD wall cells on every side: cell (row, col) lives at
+# (row + PAD) * width + (col + PAD), so every cheat jump stays inside the buffer
+PAD = 2
+width = cols + 2 * PAD
+open_cells = bytearray(width * (rows + 2 * PAD))
 for row in range(rows):
     for col in range(cols):
-        if grid[row][col] == "S":
-            start = (row, col)
-            break
-    else:
-        continue
-    break
+        if grid[row][col] != "#":
+            cell = (row + PAD) * width + (col + PAD)
+            open_cells[cell] = 1
+            if grid[row][col] == "S":
+                start = cell
+            elif grid[row][col] == "E":
+                end = cell
 
-# Initialize distances
-dist = [[-1] * cols for _ in range(rows)]
-dist[start[0]][start[1]] = 0
+# Initialize distances (-1 = wall or not reached)
+dist = array('i', [-1]) * len(open_cells)
+dist[start] = 0
 queue = deque([start])
 
 # BFS
 while queue:
-    row, col = queue.popleft()
-    if grid[row][col] == "E":
+    cell = queue.popleft()
+    if cell == end:
         break
-    for new_row, new_col in [(row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)]: # down, up, right, left
-        if 0 <= new_row < rows and 0 <= new_col < cols\
-        and grid[new_row][new_col] != "#" \
-        and dist[new_row][new_col] == -1: # not out of bounds, not wall and not visited
-            dist[new_row][new_col] = dist[row][col] + 1
-            queue.append((new_row, new_col))
+    next_dist = dist[cell] + 1
+    for new_cell in (cell + width, cell - width, cell + 1, cell - 1): # down, up, right, left
+        if open_cells[new_cell] and dist[new_cell] == -1: # not wall and not visited
+            dist[new_cell] = next_dist
+            queue.append(new_cell)
 
 # Check for possible "cheats"
-def count_cheats(grid, dist):
+def count_cheats(dist):
     count = 0
-    for row in range(rows):
-        for col in range(cols):
-            if grid[row][col] == "#": # Skip walls
-                continue
-            for new_row, new_col in [(row + 2, col), (row + 1, col + 1), (row, col + 2), (row - 1, col + 1)]:
-                if 0 <= new_row < rows and 0 <= new_col < cols and grid[new_row][new_col] != "#":
-                    if abs(dist[row][col] - dist[new_row][new_col]) >= 102: # abs saves us from having 8 directions to check
-                        count += 1 # other side will check mirrored path
+    jumps = (2 * width, width + 1, 2, 1 - width) # the 4 forward cheat endpoints
+    for cell in range(len(dist)):
+        cell_dist = dist[cell]
+        if cell_dist < 0: # Skip walls
+            continue
+        for jump in jumps:
+            jump_dist = dist[cell + jump]
+            if jump_dist >= 0 and abs(cell_dist - jump_dist) >= 102: # abs saves us from having 8 directions to check
+                count += 1 # other side will check mirrored path
     return count
 
-possible_cheats = count_cheats(grid, dist)
+possible_cheats = count_cheats(dist)
 print(possible_cheats)
 
 
@@ -63,7 +70,7 @@ print(possible_cheats)
 # Total: O(n)
 
 # Space Complexity:
-# Grid Storage: O(n)
-# Distance Matrix: O(n)
+# Grid Storage: O(n) (one byte per cell)
+# Distance Array: O(n)
 # Queue for BFS: O(n)
 # Total: O(n)
@@ -1,64 +1,71 @@
 import os
+from array import array
 from collections import deque
 with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt"), "r") as file:  
     lines = file.readlines()
 
 grid = []
 for line in lines:
-    grid.append(list(line.strip()))
+    grid.append(line.strip())
 
 rows = len(grid)
 cols = len(grid[0])
 
+# Flat grid padded by PAD wall cells on every side: cell (row, col) lives at
+# (row + PAD) * width + (col + PAD), so every cheat jump stays inside the buffer
+PAD = 20
+width = cols + 2 * PAD
+open_cells = bytearray(width * (rows + 2 * PAD))
 for row in range(rows):
     for col in range(cols):
-        if grid[row][col] == "S":
-            start = (row, col)
-            break
-    else:
-        continue
-    break
+        if grid[row][col] != "#":
+            cell = (row + PAD) * width + (col + PAD)
+            open_cells[cell] = 1
+            if grid[row][col] == "S":
+                start = cell
+            elif grid[row][col] == "E":
+                end = cell
 
-# Initialize distances
-dist = [[-1] * cols for _ in range(rows)]
-dist[start[0]][start[1]] = 0
+# Initialize distances (-1 = wall or not reached)
+dist = array('i', [-1]) * len(open_cells)
+dist[start] = 0
 queue = deque([start])
 
 # BFS
 while queue:
-    row, col = queue.popleft()
-    if grid[row][col] == "E":
+    cell = queue.popleft()
+    if cell == end:
         break
-    for new_row, new_col in [(row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)]: # down, up, right, left
-        if 0 <= new_row < rows and 0 <= new_col < cols \
-        and grid[new_row][new_col] != "#" \
-        and dist[new_row][new_col] == -1: # not out of bounds, not wall and not visited
-            dist[new_row][new_col] = dist[row][col] + 1
-            queue.append((new_row, new_col))
+    next_dist = dist[cell] + 1
+    for new_cell in (cell + width, cell - width, cell + 1, cell - 1): # down, up, right, left
+        if open_cells[new_cell] and dist[new_cell] == -1: # not wall and not visited
+            dist[new_cell] = next_dist
+            queue.append(new_cell)
 
 # Count the possible "cheats" (only this changes for part 2)
-def count_cheats_part2(grid, dist):
+def count_cheats_part2(dist):
+    # Precompute the flat offset and saving threshold of every cheat endpoint.
+    # Only the forward half of the diamond is listed: abs() below counts each
+    # pair of endpoints once, from whichever side has the larger distance.
+    jumps = []
+    for radius in range(2, 21): # Cheat duration from 2 to 20
+        for dir_row in range(radius + 1): # Vertical offset
+            dir_col = radius - dir_row # Horizontal offset
+            jumps.append((dir_row * width + dir_col, 100 + radius))
+            if dir_row and dir_col:
+                jumps.append((dir_row * width - dir_col, 100 + radius))
     count = 0
-    for row in range(rows):
-        for col in range(cols):
-            if grid[row][col] == "#": # Skip walls
-                continue
-            for radius in range(2, 21): # Cheat duration from 2 to 20
-                for dir_row in range(radius + 1): # Vertical offset
-                    dir_col = radius - dir_row # Horizontal offset
-                    for new_row, new_col in {
-                        (row + dir_row, col + dir_col), # I
-                        (row + dir_row, col - dir_col),
-                        (row - dir_row, col + dir_col),
-                        (row - dir_row, col - dir_col),
-                    }:  # All possible cheat directions
-                        if 0 <= new_row < rows and 0 <= new_col < cols \
-                        and grid[new_row][new_col] != "#":  # Valid endpoint
-                            if dist[row][col] - dist[new_row][new_col] >= 100 + radius:  # Cheat saves >= 100
-                                count += 1
+    for cell in range(len(dist)):
+        cell_dist = dist[cell]
+        if cell_dist < 0: # Skip walls
+            continue
+        for jump, needed in jumps:
+            jump_dist = dist[cell + jump]
+            if jump_dist >= 0 and abs(cell_dist - jump_dist) >= needed:  # Cheat saves >= 100
+                count += 1
     return count
 
-possible_cheats = count_cheats_part2(grid, dist)
+possible_cheats = count_cheats_part2(dist)
 print(possible_cheats)
 
 
@@ -70,13 +77,12 @@ print(possible_cheats)
 # BFS Traversal: O(n)
 # Cheat Detection:
 #   Outer Grid Iteration: O(n)
-#   Radius Range (2 to 20): O(19) ≈ O(1)
-#   Directional Checks per Cell and Radius: O(radius) ≈ O(20) ≈ O(1) per radius
+#   Precomputed Cheat Offsets (forward half of radius 2 to 20): O(400) ≈ O(1) per cell
 #   Total for Cheat Detection: O(n)
 # Total: O(n)
 
 # Space Complexity:
-# Grid Storage: O(n)
-# Distance Matrix: O(n)
+# Grid Storage: O(n) (one byte per cell)
+# Distance Array: O(n)
 # Queue for BFS: O(n)
 # Total: O(n)